@@ -7,20 +7,17 @@ Usage:
 
 import logging
 
-from src.features.build_dataset import build_growth_prediction_dataset
-
 log = logging.getLogger(__name__)
 
 
 def main() -> None:
+    # Deferred: pulls in pandas + scikit-learn (~1 s of imports)
+    from src.features.build_dataset import build_growth_prediction_dataset
+
     log.info("═══ Building Feature Datasets ═══")
-    result = build_growth_prediction_dataset(save=True)
-    log.info(
-        "Dataset built — train=%d  val=%d  test=%d",
-        len(result["X_train"]),
-        len(result["X_val"]),
-        len(result["X_test"]),
-    )
+    # Arrays go straight to disk; training memory-maps them back
+    result = build_growth_prediction_dataset(save=True, return_arrays=False)
+    log.info("Dataset written — %s", ", ".join(p.name for p in result["paths"].values()))
     log.info("═══ Done ═══")
 
 
@@ -21,15 +21,25 @@ All steps are idempotent — they skip work already marked done in ingest_log.
 
 import argparse
 import logging
-import sys
+from collections.abc import Callable
+from pathlib import Path
 
 import src  # noqa: F401 — triggers logging setup
-
 from src.db.init_db import init_db
-from src.db.queries import table_counts
+from src.db.maintenance import (
+    checkpoint_wal,
+    drop_bulk_indexes,
+    empty_tables,
+    optimize,
+    rebuild_bulk_indexes,
+)
+from src.db.queries import close_connections, connect, table_counts
 
 log = logging.getLogger(__name__)
 
+# Steps that bulk-load the tables in src.db.maintenance.BULK_TABLES
+BULK_STEPS = {2, 4, 6, 7, 8}
+
 
 def _parse_steps(raw: str | None) -> set[int]:
     """Parse a step spec like '1', '1-3', or '2,5,7' into a set of ints."""
@@ -45,73 +55,103 @@ def _parse_steps(raw: str | None) -> set[int]:
     return out
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser(description="MediaDive data ingestion")
-    parser.add_argument("--step", type=str, default=None, help="Steps to run: 1-8, e.g. '1-3' or '2,5'")
-    parser.add_argument("--db", type=str, default=None, help="Override DB path")
-    args = parser.parse_args()
+# step → (start message, result format)
+STEPS = {
+    1: ("Fetching media list...", "%d media records"),
+    2: ("Fetching medium details (solutions, recipes)...", "processed %d media"),
+    3: ("Fetching ingredients...", "%d ingredients"),
+    4: ("Fetching molecular compositions...", "%d composition rows"),
+    5: ("Fetching solutions list...", "%d solutions"),
+    6: ("Fetching solution details...", "%d recipe lines"),
+    7: ("Fetching strain-growth associations...", "%d associations"),
+    8: ("Enriching strain detail...", "%d growth observations enriched"),
+}
 
-    steps = _parse_steps(args.step)
-    db_path = init_db()
 
-    log.info("═══ MediaDive Data Ingestion Pipeline ═══")
-    log.info("Steps to run: %s", sorted(steps))
+def _run_step(step: int, fetch: Callable[[Path | None], int], db_path: Path | None) -> None:
+    """Run one ingestion step, then checkpoint the WAL it grew."""
+    message, result = STEPS[step]
+    log.info("Step %d/%d: %s", step, len(STEPS), message)
+    n = fetch(db_path)
+    log.info("  → " + result, n)
 
+    with connect(db_path) as conn:
+        checkpoint_wal(conn)
+
+
+def _run_steps(steps: set[int], db_path: Path | None) -> None:
+    """Run the selected ingestion steps in pipeline order."""
+    # Each step imports only its own fetcher module (they pull in requests)
     if 1 in steps:
         from src.ingest.fetch_media import fetch_media_list
 
-        log.info("Step 1/8: Fetching media list...")
-        n = fetch_media_list(db_path)
-        log.info("  → %d media records", n)
+        _run_step(1, fetch_media_list, db_path)
 
     if 2 in steps:
         from src.ingest.fetch_media import fetch_all_medium_details
 
-        log.info("Step 2/8: Fetching medium details (solutions, recipes)...")
-        n = fetch_all_medium_details(db_path)
-        log.info("  → processed %d media", n)
+        _run_step(2, fetch_all_medium_details, db_path)
 
     if 3 in steps:
         from src.ingest.fetch_ingredients import fetch_ingredient_list
 
-        log.info("Step 3/8: Fetching ingredients...")
-        n = fetch_ingredient_list(db_path)
-        log.info("  → %d ingredients", n)
+        _run_step(3, fetch_ingredient_list, db_path)
 
     if 4 in steps:
         from src.ingest.fetch_media import fetch_all_compositions
 
-        log.info("Step 4/8: Fetching molecular compositions...")
-        n = fetch_all_compositions(db_path)
-        log.info("  → %d composition rows", n)
+        _run_step(4, fetch_all_compositions, db_path)
 
     if 5 in steps:
         from src.ingest.fetch_media_ingredients import fetch_solution_list
 
-        log.info("Step 5/8: Fetching solutions list...")
-        n = fetch_solution_list(db_path)
-        log.info("  → %d solutions", n)
+        _run_step(5, fetch_solution_list, db_path)
 
     if 6 in steps:
         from src.ingest.fetch_media_ingredients import fetch_all_solution_details
 
-        log.info("Step 6/8: Fetching solution details...")
-        n = fetch_all_solution_details(db_path)
-        log.info("  → %d recipe lines", n)
+        _run_step(6, fetch_all_solution_details, db_path)
 
     if 7 in steps:
         from src.ingest.fetch_media import fetch_all_medium_strains
 
-        log.info("Step 7/8: Fetching strain-growth associations...")
-        n = fetch_all_medium_strains(db_path)
-        log.info("  → %d associations", n)
+        _run_step(7, fetch_all_medium_strains, db_path)
 
     if 8 in steps:
         from src.ingest.fetch_strain_growth import fetch_all_strain_details
 
-        log.info("Step 8/8: Enriching strain detail...")
-        n = fetch_all_strain_details(db_path)
-        log.info("  → %d growth observations enriched", n)
+        _run_step(8, fetch_all_strain_details, db_path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MediaDive data ingestion")
+    parser.add_argument(
+        "--step", type=str, default=None, help="Steps to run: 1-8, e.g. '1-3' or '2,5'"
+    )
+    parser.add_argument("--db", type=str, default=None, help="Override DB path")
+    args = parser.parse_args()
+
+    steps = _parse_steps(args.step)
+    db_path = init_db()
+
+    log.info("═══ MediaDive Data Ingestion Pipeline ═══")
+    log.info("Steps to run: %s", sorted(steps))
+
+    # Only a first load into empty tables is worth a full index rebuild;
+    # reruns that top up populated tables keep their indexes (and skip ANALYZE)
+    index_ddl: list[str] = []
+    if steps & BULK_STEPS:
+        with connect(db_path) as conn:
+            tables = empty_tables(conn)
+            if tables:
+                index_ddl = drop_bulk_indexes(conn, tables)
+    try:
+        _run_steps(steps, db_path)
+    finally:
+        with connect(db_path) as conn:
+            if index_ddl:
+                rebuild_bulk_indexes(conn, index_ddl)
+            optimize(conn)
 
     # ── Summary ──
     counts = table_counts(db_path)
@@ -119,6 +159,9 @@ def main() -> None:
     for table, count in sorted(counts.items()):
         log.info("  %-20s %d rows", table, count)
 
+    # Closing the last connection checkpoints the WAL and removes -wal/-shm
+    close_connections()
+
 
 if __name__ == "__main__":
     main()
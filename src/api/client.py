@@ -3,9 +3,10 @@ Resilient HTTP client for the MediaDive REST API.
 
 Features:
 - Automatic retries with exponential backoff
-- Rate-limiting between requests
-- Response caching to disk (avoids re-fetching on restart)
+- Rate-limiting shared across worker threads, honouring ``Retry-After``
+- Response caching to a local SQLite store (avoids re-fetching on restart)
 - Paginated-list iterator
+- Concurrent detail fetches over a pooled session
 """
 
 from __future__ import annotations
@@ -13,18 +14,43 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
+import sqlite3
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Any, Iterator
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
 
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from src.config import (
+    BASE_URL,
+    CACHE_MAX_AGE_DAYS,
+    MAX_WORKERS,
+    RAW_DIR,
+    REQUEST_DELAY,
+    TIMEOUT,
+)
 
-from src.config import BASE_URL, RAW_DIR, REQUEST_DELAY, TIMEOUT
+if TYPE_CHECKING:
+    import requests
 
 log = logging.getLogger(__name__)
 
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _loads(raw: bytes | str) -> Any:
+    """Parse JSON with orjson when installed, else the stdlib."""
+    return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+
+
 HEADERS = {
     "Accept": "application/json",
     "X-Requested-With": "XMLHttpRequest",
@@ -37,31 +63,135 @@ _session: requests.Session | None = None
 def _get_session() -> requests.Session:
     global _session
     if _session is None:
+        # Imported here so CLI entry points that never hit the API skip
+        # the requests/urllib3 import cost.
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
         _session = requests.Session()
         _session.headers.update(HEADERS)
         retry = Retry(
             total=4,
             backoff_factor=1.5,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=[500, 502, 503, 504],
             allowed_methods=["GET"],
+            # urllib3 otherwise retries any 429 carrying Retry-After inside
+            # the adapter; let _send() see it so all workers back off together
+            respect_retry_after_header=False,
+        )
+        # One pooled connection per worker thread, see get_details().
+        adapter = HTTPAdapter(
+            pool_connections=MAX_WORKERS,
+            pool_maxsize=MAX_WORKERS,
+            max_retries=retry,
         )
-        _session.mount("https://", HTTPAdapter(max_retries=retry))
-        _session.mount("http://", HTTPAdapter(max_retries=retry))
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
     return _session
 
 
+# ── Rate limiting ───────────────────────────────────────────
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces request *starts* ``interval`` seconds apart.
+
+    Each caller reserves the next free slot under the lock and sleeps
+    outside it, so the delay overlaps with other threads' in-flight
+    requests instead of being added after every response.
+
+    The spacing adapts AIMD-style: ``slow_down()`` (on 429) doubles it, and
+    every ``speed_up()`` (on a served request) shrinks it by 10% until it is
+    back at the configured ``interval``.
+    """
+
+    min_backoff = 0.1    # seconds; lets a zero REQUEST_DELAY still back off
+    max_interval = 10.0
+
+    def __init__(self, interval: float) -> None:
+        self.base_interval = interval
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller's next request for at least *seconds*."""
+        with self._lock:
+            self._next = max(self._next, time.monotonic() + seconds)
+
+    def slow_down(self) -> None:
+        """Double the spacing (the server is throttling us)."""
+        with self._lock:
+            self.interval = min(self.max_interval, max(self.interval * 2, self.min_backoff))
+
+    def speed_up(self) -> None:
+        """Ease the spacing back toward ``base_interval`` after a served request."""
+        if self.interval > self.base_interval:
+            with self._lock:
+                eased = self.interval * 0.9
+                # snap back once within 1 ms, or a zero base would never be reached
+                self.interval = eased if eased - self.base_interval > 1e-3 else self.base_interval
+
+
+_limiter = RateLimiter(REQUEST_DELAY)
+
+# Attempts per request when the server answers 429 Too Many Requests
+MAX_THROTTLE_RETRIES = 5
+
+
+def _retry_after(value: str | None, attempt: int) -> float:
+    """Seconds to wait from a ``Retry-After`` header (delta or HTTP date), else exponential backoff."""
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                when = parsedate_to_datetime(value)
+                return max(0.0, when.timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    return max(REQUEST_DELAY, 1.0) * 2 ** attempt
+
+
 # ── Low-level GET ───────────────────────────────────────────
 
-def get(endpoint: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
-    """GET a JSON response from MediaDive, with retries and rate-limiting."""
+def _send(
+    endpoint: str,
+    params: dict[str, Any] | None = None,
+    headers: dict[str, str] | None = None,
+) -> requests.Response:
+    """Issue a rate-limited GET, backing off on 429.  Raises on 4xx/5xx."""
     url = f"{BASE_URL}{endpoint}"
     session = _get_session()
 
-    log.debug("GET %s  params=%s", url, params)
-    r = session.get(url, params=params, timeout=TIMEOUT)
+    for attempt in range(MAX_THROTTLE_RETRIES):
+        _limiter.wait()
+        log.debug("GET %s  params=%s", url, params)
+        r = session.get(url, params=params, headers=headers, timeout=TIMEOUT)
+        if r.status_code != 429:
+            _limiter.speed_up()
+            break
+
+        delay = _retry_after(r.headers.get("Retry-After"), attempt)
+        log.warning("429 from %s — pausing requests for %.1fs", url, delay)
+        _limiter.slow_down()
+        _limiter.pause(delay)
 
     r.raise_for_status()
+    return r
+
 
+def _json_body(r: requests.Response) -> bytes:
+    """Return the raw body of a JSON response, or raise if it is not JSON."""
     content_type = r.headers.get("Content-Type", "")
     if "application/json" not in content_type:
         log.error(
@@ -72,8 +202,113 @@ def get(endpoint: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
         )
         raise RuntimeError(f"Expected JSON, got {content_type} from {r.url}")
 
-    time.sleep(REQUEST_DELAY)
-    return r.json()  # type: ignore[no-any-return]
+    return r.content
+
+
+def get(endpoint: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+    """GET a JSON response from MediaDive, with retries and rate-limiting."""
+    return _loads(_json_body(_send(endpoint, params)))  # type: ignore[no-any-return]
+
+
+# ── Response cache ──────────────────────────────────────────
+#
+# Responses live in one SQLite key-value table per cache directory
+# instead of one small file each: a hit is a primary-key lookup rather
+# than stat + open + read, and a full crawl no longer leaves hundreds of
+# thousands of files behind.  The connection is shared by the worker
+# threads, so every access goes through ``_cache_lock``.
+
+_cache_lock = threading.Lock()
+_cache_dbs: dict[Path, sqlite3.Connection] = {}
+
+
+def _cache_key(endpoint: str, params: dict[str, Any] | None) -> str:
+    """Cache key for a request; see ``_hash_request``."""
+    items = tuple(sorted(params.items())) if params else ()
+    try:
+        return _hash_request(endpoint, items)
+    except TypeError:  # unhashable values (e.g. lists) cannot be memoized
+        return _request_digest(endpoint, items)
+
+
+def _request_digest(endpoint: str, params: tuple[tuple[str, Any], ...]) -> str:
+    """Hash a canonical (key-sorted, compact) JSON encoding of the request."""
+    key_src = json.dumps(
+        {"endpoint": endpoint, "params": dict(params)},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.blake2b(key_src.encode(), digest_size=8).hexdigest()
+
+
+@lru_cache(maxsize=65536)
+def _hash_request(endpoint: str, params: tuple[tuple[str, Any], ...]) -> str:
+    """Memoized ``_request_digest``: repeat lookups skip the JSON encoding."""
+    return _request_digest(endpoint, params)
+
+
+def _cache_db(cache_root: Path) -> sqlite3.Connection:
+    """Return the response store for *cache_root*, opening it on first use.  Hold ``_cache_lock``."""
+    conn = _cache_dbs.get(cache_root)
+    if conn is None:
+        cache_root.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(cache_root / "responses.db", check_same_thread=False)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key        TEXT PRIMARY KEY,
+                body       BLOB NOT NULL,
+                etag       TEXT,
+                fetched_at REAL               -- unix time; NULL = unknown
+            ) WITHOUT ROWID
+            """
+        )
+        columns = {r[1] for r in conn.execute("PRAGMA table_info(responses)")}
+        for name, decl in (("etag", "TEXT"), ("fetched_at", "REAL")):
+            if name not in columns:
+                conn.execute(f"ALTER TABLE responses ADD COLUMN {name} {decl}")
+        _cache_dbs[cache_root] = conn
+    return conn
+
+
+def _legacy_cache_key(endpoint: str, params: dict[str, Any] | None) -> str:
+    """Key the pre-SQLite cache used to name its ``<key>.json`` files."""
+    key_src = f"{endpoint}|{sorted(params.items()) if params else ''}"
+    return hashlib.sha256(key_src.encode()).hexdigest()[:16]
+
+
+def _adopt_legacy_file(
+    conn: sqlite3.Connection,
+    cache_root: Path,
+    key: str,
+    endpoint: str,
+    params: dict[str, Any] | None,
+) -> bytes | None:
+    """
+    Move this request's legacy ``<sha256 key>.json`` file, if any, into the store.
+
+    Legacy names cannot be mapped to the new keys without the request, so
+    files are re-keyed lazily on the first lookup that misses.  Hold
+    ``_cache_lock``.
+    """
+    path = cache_root / f"{_legacy_cache_key(endpoint, params)}.json"
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    conn.execute("INSERT OR IGNORE INTO responses (key, body) VALUES (?, ?)", (key, raw))
+    conn.commit()
+    path.unlink()
+    log.debug("Migrated legacy cache file %s → %s", path.name, key)
+    return raw
+
+
+def _is_fresh(fetched_at: float | None) -> bool:
+    if CACHE_MAX_AGE_DAYS <= 0:
+        return True
+    return fetched_at is not None and time.time() - fetched_at < CACHE_MAX_AGE_DAYS * 86400
 
 
 def get_cached(
@@ -83,30 +318,69 @@ def get_cached(
     cache_dir: str = "api_cache",
 ) -> dict[str, Any]:
     """
-    GET with local JSON disk cache.
+    GET with a local on-disk response cache.
 
     Cache key is derived from the full URL + params so re-runs skip
     already-fetched resources.  Delete ``data/raw/api_cache/`` to
     force a full re-fetch.
+
+    With ``MEDIADIVE_CACHE_MAX_AGE_DAYS`` set, older entries are
+    revalidated with ``If-None-Match`` — a ``304 Not Modified`` keeps the
+    cached body and only refreshes its timestamp.
     """
     cache_root = RAW_DIR / cache_dir
-    cache_root.mkdir(parents=True, exist_ok=True)
-
-    key_src = f"{endpoint}|{sorted(params.items()) if params else ''}"
-    key = hashlib.sha256(key_src.encode()).hexdigest()[:16]
-    cache_path = cache_root / f"{key}.json"
+    key = _cache_key(endpoint, params)
+
+    with _cache_lock:
+        conn = _cache_db(cache_root)
+        row = conn.execute(
+            "SELECT body, etag, fetched_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            legacy = _adopt_legacy_file(conn, cache_root, key, endpoint, params)
+            if legacy is not None:
+                row = (legacy, None, None)
+    if row is not None and _is_fresh(row[2]):
+        log.debug("Cache hit: %s → %s", endpoint, key)
+        return _loads(row[0])  # type: ignore[no-any-return]
+
+    etag = row[1] if row is not None else None
+    r = _send(endpoint, params, {"If-None-Match": etag} if etag else None)
+    if r.status_code == 304 and row is not None:
+        log.debug("Not modified: %s → %s", endpoint, key)
+        raw = row[0]
+    else:
+        # Store the body exactly as received — no parse/re-serialize round-trip
+        raw = _json_body(r)
+        etag = r.headers.get("ETag")
+
+    with _cache_lock:
+        conn = _cache_db(cache_root)
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, body, etag, fetched_at) VALUES (?, ?, ?, ?)",
+            (key, raw, etag, time.time()),
+        )
+        conn.commit()
+    return _loads(raw)  # type: ignore[no-any-return]
 
-    if cache_path.exists():
-        log.debug("Cache hit: %s → %s", endpoint, cache_path.name)
-        return json.loads(cache_path.read_text())
 
-    data = get(endpoint, params)
+# ── Paginated list iterator ─────────────────────────────────
 
-    cache_path.write_text(json.dumps(data, indent=2))
-    return data
+def _fetch_page(
+    endpoint: str,
+    offset: int,
+    limit: int,
+    extra_params: dict[str, Any] | None,
+    use_cache: bool,
+) -> dict[str, Any]:
+    params: dict[str, Any] = {"limit": limit, "offset": offset}
+    if extra_params:
+        params.update(extra_params)
 
+    log.info("Fetching %s  page=%d  offset=%d", endpoint, offset // limit, offset)
+    fetcher = get_cached if use_cache else get
+    return fetcher(endpoint, params)
 
-# ── Paginated list iterator ─────────────────────────────────
 
 def paginate(
     endpoint: str,
@@ -114,36 +388,105 @@ def paginate(
     limit: int = 200,
     extra_params: dict[str, Any] | None = None,
     use_cache: bool = True,
+    start: int = 0,
 ) -> Iterator[list[dict[str, Any]]]:
     """
     Yield successive pages of ``data`` items from a paginated endpoint.
 
-    Stops when the API returns an empty ``data`` list.
+    Stops when the API returns an empty ``data`` list.  The next page is
+    requested on a background thread before the current one is yielded,
+    so its round-trip overlaps the caller's processing of this page.
     """
-    offset = 0
-    page = 0
-    fetcher = get_cached if use_cache else get
-
-    while True:
-        params: dict[str, Any] = {"limit": limit, "offset": offset}
-        if extra_params:
-            params.update(extra_params)
-
-        log.info("Fetching %s  page=%d  offset=%d", endpoint, page, offset)
-        resp = fetcher(endpoint, params)
-
-        items = resp.get("data", [])
-        if not items:
-            break
-
-        yield items
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mediadive-page")
+    try:
+        offset = start
+        pending = pool.submit(_fetch_page, endpoint, offset, limit, extra_params, use_cache)
+        while True:
+            items = pending.result().get("data", [])
+            if not items:
+                break
+
+            # If fewer items than limit, we've reached the last page
+            last_page = len(items) < limit
+            if not last_page:
+                offset += limit
+                pending = pool.submit(_fetch_page, endpoint, offset, limit, extra_params, use_cache)
+
+            yield items
+
+            if last_page:
+                break
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def paginate_bulk(
+    endpoint: str,
+    *,
+    limit: int = 200,
+    total: int | None = None,
+    extra_params: dict[str, Any] | None = None,
+    use_cache: bool = True,
+    max_workers: int = MAX_WORKERS,
+) -> Iterator[list[dict[str, Any]]]:
+    """
+    Like ``paginate`` but fetches all pages concurrently.
 
-        # If fewer items than limit, we've reached the last page
-        if len(items) < limit:
-            break
+    Page offsets come from *total*, or from the ``count`` field of the
+    first page when not given.  Pages are yielded in offset order.  If the
+    API reports no count, falls back to sequential ``paginate``; the same
+    happens after the last counted page if it came back full, so a stale
+    or low count never truncates the listing.
+    """
+    first = _fetch_page(endpoint, 0, limit, extra_params, use_cache)
+    items = first.get("data", [])
+    if not items:
+        return
+    yield items
+    if len(items) < limit:
+        return
+
+    if total is None:
+        total = first.get("count")
+    if total is None:
+        yield from paginate(
+            endpoint, limit=limit, extra_params=extra_params, use_cache=use_cache, start=limit,
+        )
+        return
+
+    next_offset = limit
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mediadive-page")
+    try:
+        pages = pool.map(
+            lambda offset: _fetch_page(endpoint, offset, limit, extra_params, use_cache),
+            range(limit, total, limit),
+        )
+        for resp in pages:
+            items = resp.get("data", [])
+            if not items:
+                return
+            yield items
+            if len(items) < limit:
+                return
+            next_offset += limit
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    # Every counted page was full — there may be more than the count said
+    yield from paginate(
+        endpoint, limit=limit, extra_params=extra_params, use_cache=use_cache, start=next_offset,
+    )
+
+
+def iter_items(endpoint: str, **kwargs: Any) -> Iterator[dict[str, Any]]:
+    """
+    Yield individual ``data`` items across all pages; *kwargs* go to ``paginate_bulk``.
 
-        offset += limit
-        page += 1
+    Pages are fetched concurrently when the API reports a ``count``, and
+    walked sequentially (with prefetch) otherwise.
+    """
+    for page in paginate_bulk(endpoint, **kwargs):
+        yield from page
 
 
 def get_detail(
@@ -162,3 +505,43 @@ def get_detail(
         raise ValueError(f"No 'data' key in response from {endpoint}")
     return resp["data"]  # type: ignore[no-any-return]
 
+
+def get_details(
+    keys: Iterable[Any],
+    endpoint: str,
+    *,
+    max_workers: int = MAX_WORKERS,
+    use_cache: bool = True,
+    window: int | None = None,
+) -> Iterator[tuple[Any, Any]]:
+    """
+    Fetch ``endpoint.format(key)`` for every key on a thread pool.
+
+    Yields ``(key, data)`` pairs in completion order, where ``data`` is the
+    ``data`` payload or the exception raised while fetching it.  Only the
+    HTTP calls run on worker threads — callers consume results on their
+    own thread, so SQLite writes stay single-threaded.
+
+    At most *window* requests (default ``2 * max_workers``) are queued or
+    unconsumed at a time, so memory stays flat however many keys there are.
+    """
+    window = window or 2 * max_workers
+    key_iter = iter(keys)
+    pending: dict[Future[Any], Any] = {}
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mediadive-get")
+
+    def submit(n: int) -> None:
+        for key in islice(key_iter, n):
+            pending[pool.submit(get_detail, endpoint.format(key), use_cache=use_cache)] = key
+
+    try:
+        submit(window)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                key = pending.pop(fut)
+                exc = fut.exception()
+                yield key, exc if exc is not None else fut.result()
+            submit(len(done))
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -18,10 +18,15 @@ PROCESSED_DIR = DATA_DIR / "processed"
 MODELS_DIR = DATA_DIR / "models"
 DB_PATH = Path(os.getenv("DB_PATH", str(DATA_DIR / "mediadive.db")))
 
+# ── Ingest ──────────────────────────────────────────────────
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "500"))  # detail rows per commit
+
 # ── MediaDive API ───────────────────────────────────────────
 BASE_URL = os.getenv("MEDIADIVE_BASE_URL", "https://mediadive.dsmz.de/rest")
 REQUEST_DELAY = float(os.getenv("MEDIADIVE_REQUEST_DELAY", "0.5"))
 TIMEOUT = int(os.getenv("MEDIADIVE_TIMEOUT", "30"))
+MAX_WORKERS = int(os.getenv("MEDIADIVE_WORKERS", "8"))  # concurrent detail fetches
+CACHE_MAX_AGE_DAYS = float(os.getenv("MEDIADIVE_CACHE_MAX_AGE_DAYS", "0"))  # 0 = never revalidate
 
 # ── Logging ─────────────────────────────────────────────────
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -9,11 +9,24 @@ import sqlite3
 from pathlib import Path
 
 from src.config import DB_PATH
+from src.db.queries import apply_pragmas
 
 log = logging.getLogger(__name__)
 
 SCHEMA_PATH = Path(__file__).resolve().parent / "schema.sql"
 
+# 8 KiB pages suit the wide composition/recipe rows better than the 4 KiB default
+PAGE_SIZE = 8192
+
+
+def _split_pragmas(script: str) -> tuple[str, str]:
+    """Split *script* into its ``PRAGMA`` lines and everything else."""
+    pragmas: list[str] = []
+    ddl: list[str] = []
+    for line in script.splitlines():
+        (pragmas if line.lstrip().upper().startswith("PRAGMA") else ddl).append(line)
+    return "\n".join(pragmas), "\n".join(ddl)
+
 
 def init_db(db_path: Path | None = None) -> Path:
     """Create the database and apply the schema.  Returns the resolved path."""
@@ -24,9 +37,17 @@ def init_db(db_path: Path | None = None) -> Path:
     log.info("%s database at %s", "Migrating" if existed else "Creating", path)
 
     conn = sqlite3.connect(path)
-    conn.execute("PRAGMA foreign_keys = ON")
+    if not existed:
+        # Only takes effect before the first write (and WAL fixes it after)
+        conn.execute(f"PRAGMA page_size = {PAGE_SIZE}")
+    conn.execute("PRAGMA journal_mode = WAL")
+    apply_pragmas(conn)
     with open(SCHEMA_PATH) as f:
-        conn.executescript(f.read())
+        pragmas, ddl = _split_pragmas(f.read())
+    # journal_mode / foreign_keys are silently ignored inside a transaction
+    conn.executescript(pragmas)
+    # One transaction for the DDL instead of one per statement
+    conn.executescript(f"BEGIN;\n{ddl}\nCOMMIT;")
     conn.close()
     log.info("Database ready.")
     return path
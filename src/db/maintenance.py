@@ -0,0 +1,79 @@
+"""
+Bulk-load maintenance helpers.
+
+Secondary indexes on the large detail tables are dropped while the ingest
+pipeline first loads them and rebuilt once at the end — one sorted build is
+far cheaper than a B-tree update per inserted row.  A rebuild re-sorts the
+whole table, though, so tables that already hold data keep their indexes:
+a partial rerun adds few rows and would pay for the rebuild anyway.  If a
+run dies in between, the next ``init_db`` re-creates them from schema.sql.
+
+Between steps the WAL is checkpointed and truncated, so no single commit
+inside a step pays for folding a multi-hundred-MB WAL back into the DB.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from collections.abc import Sequence
+
+log = logging.getLogger(__name__)
+
+# Tables written row-by-row during ingest steps 2, 4, 6, 7 and 8
+BULK_TABLES = ("media_composition", "solution_recipe", "strain_growth")
+
+
+def empty_tables(conn: sqlite3.Connection, tables: Sequence[str] = BULK_TABLES) -> list[str]:
+    """Return the *tables* that hold no rows yet."""
+    return [t for t in tables if conn.execute(f'SELECT 1 FROM "{t}" LIMIT 1').fetchone() is None]
+
+
+def drop_bulk_indexes(
+    conn: sqlite3.Connection,
+    tables: Sequence[str] = BULK_TABLES,
+) -> list[str]:
+    """
+    Drop the non-PK indexes on *tables*.
+
+    Returns their ``CREATE INDEX`` statements for ``rebuild_bulk_indexes``.
+    Primary-key autoindexes are left alone (they have no stored SQL and the
+    upserts depend on them).
+    """
+    placeholders = ", ".join("?" * len(tables))
+    rows = conn.execute(
+        f"""
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN ({placeholders})
+        """,  # noqa: S608
+        tuple(tables),
+    ).fetchall()
+
+    for name, _ in rows:
+        conn.execute(f'DROP INDEX IF EXISTS "{name}"')
+    conn.commit()
+
+    log.info("Dropped %d indexes for bulk load: %s", len(rows), ", ".join(r[0] for r in rows))
+    return [r[1] for r in rows]
+
+
+def rebuild_bulk_indexes(conn: sqlite3.Connection, ddl: Sequence[str]) -> None:
+    """Re-create indexes dropped by ``drop_bulk_indexes`` and refresh planner stats."""
+    for stmt in ddl:
+        conn.execute(stmt)
+    conn.execute("ANALYZE")
+    conn.commit()
+    log.info("Rebuilt %d indexes.", len(ddl))
+
+
+def checkpoint_wal(conn: sqlite3.Connection) -> None:
+    """Copy the WAL into the main DB file and truncate it to zero bytes."""
+    busy, frames, done = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    if busy:
+        # A reader still holds an old snapshot; the rest is picked up next time
+        log.debug("WAL checkpoint incomplete: %d/%d frames", done, frames)
+
+
+def optimize(conn: sqlite3.Connection) -> None:
+    """Let SQLite refresh planner statistics that have drifted (cheap when nothing has)."""
+    conn.execute("PRAGMA optimize")
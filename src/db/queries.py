@@ -7,33 +7,200 @@ so callers don't need to know about sqlite3 cursors.
 
 from __future__ import annotations
 
+import atexit
 import logging
 import sqlite3
+import threading
 from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Any, Iterator
+from typing import Any, Iterable, Iterator, Sequence
 
 from src.config import DB_PATH
 
 log = logging.getLogger(__name__)
 
+# Per-connection settings.  ``journal_mode = WAL`` is persisted in the DB
+# file by schema.sql; everything here resets on each new connection.
+# synchronous=NORMAL is safe in WAL mode and drops the fsync per commit;
+# mmap lets the read-heavy matrix/report queries skip read() syscalls.
+PRAGMAS = (
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -262144",      # 256 MiB
+    "PRAGMA mmap_size = 1073741824",    # 1 GiB
+)
+
+
+def apply_pragmas(conn: sqlite3.Connection) -> None:
+    """Apply the shared connection PRAGMAs to *conn*."""
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+
+
+# Connections are opened once per (thread, DB file, mode) and reused, so
+# helpers that are called thousands of times during ingest or dataset
+# building skip the open + PRAGMA round-trip and keep a warm statement cache.
+_local = threading.local()
+_open_lock = threading.Lock()
+_open_conns: list[tuple[sqlite3.Connection, bool]] = []  # (connection, read_only)
+_generation = 0  # bumped by close_connections() to invalidate every thread's cache
+
+
+def _open(path: Path, read_only: bool) -> sqlite3.Connection:
+    if read_only:
+        conn = sqlite3.connect(
+            f"{path.as_uri()}?mode=ro", uri=True, cached_statements=512, check_same_thread=False,
+        )
+    else:
+        conn = sqlite3.connect(path, cached_statements=512, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    apply_pragmas(conn)
+    if read_only:
+        conn.execute("PRAGMA query_only = ON")
+    with _open_lock:
+        _open_conns.append((conn, read_only))
+    return conn
+
 
 @contextmanager
-def connect(db_path: Path | None = None) -> Iterator[sqlite3.Connection]:
-    """Context-managed SQLite connection with row-factory enabled."""
-    conn = sqlite3.connect(db_path or DB_PATH)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
+def connect(
+    db_path: Path | None = None,
+    *,
+    read_only: bool = False,
+) -> Iterator[sqlite3.Connection]:
+    """
+    Context-managed SQLite connection with row-factory enabled.
+
+    The underlying connection is cached per thread and reused.  When the
+    outermost ``with`` block exits, anything the caller did not commit is
+    rolled back — the same outcome as closing a fresh connection.
+
+    ``read_only=True`` opens the file with ``mode=ro`` and sets
+    ``query_only`` — used by the read helpers and reporting so they can
+    never take the write lock away from a running ingest.
+    """
+    key = (Path(db_path or DB_PATH).resolve(), read_only)
+    if getattr(_local, "generation", None) != _generation:
+        _local.conns = {}
+        _local.generation = _generation
+    cache: dict[tuple[Path, bool], list[Any]] = _local.conns
+    entry = cache.get(key)
+    if entry is None:
+        entry = cache[key] = [_open(*key), 0]  # [connection, nesting depth]
+
+    conn = entry[0]
+    entry[1] += 1
     try:
         yield conn
     finally:
+        entry[1] -= 1
+        if entry[1] == 0 and conn.in_transaction:
+            conn.rollback()
+
+
+def close_connections() -> None:
+    """
+    Close every cached connection (all threads).  Runs at interpreter exit.
+
+    Read-only connections go first: only a writable connection can
+    checkpoint the WAL and delete the -wal/-shm files when it is the last
+    one to close.
+    """
+    global _generation
+    with _open_lock:
+        conns = sorted(_open_conns, key=lambda c: not c[1])
+        _open_conns.clear()
+        _generation += 1
+    for conn, _ in conns:
         conn.close()
 
 
+atexit.register(close_connections)
+
+
+def begin_immediate(conn: sqlite3.Connection) -> None:
+    """
+    Open a write transaction on *conn* unless one is already open.
+
+    ``BEGIN IMMEDIATE`` takes the write lock up front, so a batch never
+    fails half-way on a read→write lock upgrade (which skips the busy
+    timeout) the way sqlite3's implicit deferred ``BEGIN`` can.
+    """
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+
+# Older SQLite builds cap bound parameters at 999 per statement.
+MAX_SQL_PARAMS = 900
+
+
+@lru_cache(maxsize=128)
+def _insert_sql(table: str, columns: tuple[str, ...], n_rows: int, conflict: str, upsert: str) -> str:
+    row = "(" + ", ".join("?" * len(columns)) + ")"
+    verb = f"INSERT {conflict} INTO" if conflict else "INSERT INTO"
+    sql = f"{verb} {table} ({', '.join(columns)}) VALUES " + ", ".join([row] * n_rows)
+    return f"{sql} {upsert}" if upsert else sql
+
+
+def bulk_insert(
+    conn: sqlite3.Connection,
+    table: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    *,
+    conflict: str = "OR IGNORE",
+    upsert: str = "",
+) -> int:
+    """
+    Insert many rows using multi-row ``INSERT ... VALUES (...), (...)`` statements.
+
+    Rows are packed so no statement binds more than ``MAX_SQL_PARAMS``
+    values, and are pulled from *rows* one statement at a time, so a
+    generator is never materialized in full.  ``conflict`` goes after
+    ``INSERT`` (pass ``""`` together with an ``upsert`` clause such as
+    ``ON CONFLICT(...) DO UPDATE SET ...``).
+    Does not commit.  Returns the number of rows submitted.
+    """
+    cols = tuple(columns)
+    per_stmt = max(1, MAX_SQL_PARAMS // len(cols))
+    it = iter(rows)
+
+    total = 0
+    while chunk := list(islice(it, per_stmt)):
+        sql = _insert_sql(table, cols, len(chunk), conflict, upsert)
+        conn.execute(sql, [v for row in chunk for v in row])
+        total += len(chunk)
+    return total
+
+
 def _rows(sql: str, params: tuple = (), db_path: Path | None = None) -> list[dict[str, Any]]:
     """Run a query and return results as a list of dicts."""
-    with connect(db_path) as conn:
-        return [dict(r) for r in conn.execute(sql, params).fetchall()]
+    with connect(db_path, read_only=True) as conn:
+        # Plain tuples + one zip per row beat dict(sqlite3.Row)'s per-key lookups
+        cur = conn.cursor()
+        cur.row_factory = None
+        rows = cur.execute(sql, params).fetchall()
+        names = [d[0] for d in cur.description]
+    return [dict(zip(names, r, strict=True)) for r in rows]
+
+
+def _columns(sql: str, params: tuple = (), db_path: Path | None = None) -> dict[str, list[Any]]:
+    """
+    Run a query and return results column-wise as ``{column: [values...]}``.
+
+    Skips the per-row dict built by ``_rows`` — the shape pandas and numpy
+    want anyway (``pd.DataFrame(cols)``, ``np.asarray(cols[name])``).
+    """
+    with connect(db_path, read_only=True) as conn:
+        cur = conn.execute(sql, params)
+        names = [d[0] for d in cur.description]
+        rows = cur.fetchall()
+    if not rows:
+        return {n: [] for n in names}
+    return {n: list(col) for n, col in zip(names, zip(*rows, strict=True), strict=True)}
 
 
 # ── Media ────────────────────────────────────────────────────
@@ -43,13 +210,13 @@ def get_all_media(db_path: Path | None = None) -> list[dict[str, Any]]:
 
 
 def get_media_ids(db_path: Path | None = None) -> list[str]:
-    with connect(db_path) as conn:
+    with connect(db_path, read_only=True) as conn:
         return [r[0] for r in conn.execute("SELECT media_id FROM media").fetchall()]
 
 
 def get_media_ids_without_detail(db_path: Path | None = None) -> list[str]:
     """Return media IDs that haven't had their /medium/:id detail fetched yet."""
-    with connect(db_path) as conn:
+    with connect(db_path, read_only=True) as conn:
         return [
             r[0]
             for r in conn.execute(
@@ -64,9 +231,20 @@ def get_all_ingredients(db_path: Path | None = None) -> list[dict[str, Any]]:
     return _rows("SELECT * FROM ingredients", db_path=db_path)
 
 
+def get_ingredient_ids(db_path: Path | None = None) -> list[int]:
+    """Return every ingredient_id in ascending order (a primary-key scan, no sort)."""
+    with connect(db_path, read_only=True) as conn:
+        return [
+            r[0]
+            for r in conn.execute(
+                "SELECT ingredient_id FROM ingredients ORDER BY ingredient_id"
+            ).fetchall()
+        ]
+
+
 def get_ingredient_index(db_path: Path | None = None) -> dict[int, str]:
     """Return {ingredient_id: ingredient_name} mapping."""
-    with connect(db_path) as conn:
+    with connect(db_path, read_only=True) as conn:
         rows = conn.execute("SELECT ingredient_id, ingredient_name FROM ingredients").fetchall()
     return {r[0]: r[1] for r in rows}
 
@@ -90,6 +268,14 @@ def get_full_composition_matrix(db_path: Path | None = None) -> list[dict[str, A
     )
 
 
+def get_full_composition_columns(db_path: Path | None = None) -> dict[str, list[Any]]:
+    """Column-wise ``media_id`` / ``ingredient_id`` / ``g_per_l`` lists for every composition row."""
+    return _columns(
+        "SELECT media_id, ingredient_id, g_per_l FROM media_composition",
+        db_path=db_path,
+    )
+
+
 # ── Solutions ────────────────────────────────────────────────
 
 def get_solutions_for_medium(media_id: str, db_path: Path | None = None) -> list[dict[str, Any]]:
@@ -124,6 +310,14 @@ def get_all_growth(db_path: Path | None = None) -> list[dict[str, Any]]:
     return _rows("SELECT * FROM strain_growth", db_path=db_path)
 
 
+def get_all_growth_columns(db_path: Path | None = None) -> dict[str, list[Any]]:
+    """Column-wise ``strain_id`` / ``media_id`` / ``growth`` lists for every observation."""
+    return _columns(
+        "SELECT strain_id, media_id, growth FROM strain_growth",
+        db_path=db_path,
+    )
+
+
 def get_growth_for_strain(strain_id: int, db_path: Path | None = None) -> list[dict[str, Any]]:
     return _rows(
         "SELECT * FROM strain_growth WHERE strain_id = ?",
@@ -134,29 +328,81 @@ def get_growth_for_strain(strain_id: int, db_path: Path | None = None) -> list[d
 
 # ── Ingest tracking ─────────────────────────────────────────
 
+_LOG_TASK_SQL = """
+    INSERT INTO ingest_log (task, status, updated_at, error_message)
+    VALUES (?, ?, datetime('now'), ?)
+    ON CONFLICT(task) DO UPDATE SET
+        status        = excluded.status,
+        updated_at    = excluded.updated_at,
+        error_message = excluded.error_message
+"""
+
+
+def log_task(
+    conn: sqlite3.Connection,
+    task: str,
+    status: str = "done",
+    error: str | None = None,
+) -> None:
+    """
+    Record a task outcome on an already-open connection.
+
+    Does not commit — callers batch this with the rows the task wrote so
+    both land in the same transaction.
+    """
+    conn.execute(_LOG_TASK_SQL, (task, status, error))
+
+
+class IngestLog:
+    """
+    Buffer of ``ingest_log`` outcomes written with a single ``executemany``.
+
+    ``flush()`` does not commit — call it right before committing the rows
+    the buffered tasks wrote.  Used as a context manager it flushes on a
+    clean exit.
+    """
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+        self._buf: list[tuple[str, str, str | None]] = []
+
+    def done(self, task: str) -> None:
+        self._buf.append((task, "done", None))
+
+    def error(self, task: str, message: str) -> None:
+        self._buf.append((task, "error", message))
+
+    def flush(self) -> None:
+        if self._buf:
+            self.conn.executemany(_LOG_TASK_SQL, self._buf)
+            self._buf.clear()
+
+    def __enter__(self) -> IngestLog:
+        return self
+
+    def __exit__(self, exc_type: Any, *exc: Any) -> None:
+        if exc_type is None:
+            self.flush()
+
+
 def mark_task_done(task: str, db_path: Path | None = None) -> None:
     with connect(db_path) as conn:
-        conn.execute(
-            """
-            INSERT INTO ingest_log (task, status, updated_at)
-            VALUES (?, 'done', datetime('now'))
-            ON CONFLICT(task) DO UPDATE SET status='done', updated_at=datetime('now')
-            """,
-            (task,),
-        )
+        log_task(conn, task)
+        conn.commit()
+
+
+def mark_tasks_done(tasks: Iterable[str], db_path: Path | None = None) -> None:
+    """Mark many tasks done in a single transaction."""
+    with connect(db_path) as conn:
+        with IngestLog(conn) as ingest_log:
+            for task in tasks:
+                ingest_log.done(task)
         conn.commit()
 
 
 def mark_task_error(task: str, error: str, db_path: Path | None = None) -> None:
     with connect(db_path) as conn:
-        conn.execute(
-            """
-            INSERT INTO ingest_log (task, status, updated_at, error_message)
-            VALUES (?, 'error', datetime('now'), ?)
-            ON CONFLICT(task) DO UPDATE SET status='error', updated_at=datetime('now'), error_message=?
-            """,
-            (task, error, error),
-        )
+        log_task(conn, task, "error", error)
         conn.commit()
 
 
@@ -168,17 +414,44 @@ def is_task_done(task: str, db_path: Path | None = None) -> bool:
     return row is not None and row[0] == "done"
 
 
+def get_pending_ids(
+    table: str,
+    id_column: str,
+    task_prefix: str,
+    db_path: Path | None = None,
+) -> list[Any]:
+    """
+    Return every ``id_column`` value in *table* whose ``{task_prefix}:{id}``
+    task is not marked done.
+
+    A single anti-join against the ``ingest_log`` primary key, instead of
+    one ``is_task_done`` round-trip per ID.
+    """
+    sql = f"""
+        SELECT t.{id_column} FROM {table} t
+        WHERE NOT EXISTS (
+            SELECT 1 FROM ingest_log l
+            WHERE l.task = ? || ':' || t.{id_column} AND l.status = 'done'
+        )
+    """  # noqa: S608
+    with connect(db_path) as conn:
+        return [r[0] for r in conn.execute(sql, (task_prefix,)).fetchall()]
+
+
 # ── Summary stats ────────────────────────────────────────────
 
+COUNTED_TABLES = (
+    "media", "ingredients", "solutions", "media_solutions",
+    "solution_recipe", "solution_steps", "media_composition",
+    "strains", "strain_growth",
+)
+
+_TABLE_COUNTS_SQL = " UNION ALL ".join(
+    f"SELECT '{t}', COUNT(*) FROM {t}" for t in COUNTED_TABLES  # noqa: S608
+)
+
+
 def table_counts(db_path: Path | None = None) -> dict[str, int]:
-    """Quick row counts for all tables."""
-    tables = [
-        "media", "ingredients", "solutions", "media_solutions",
-        "solution_recipe", "solution_steps", "media_composition",
-        "strains", "strain_growth",
-    ]
-    counts: dict[str, int] = {}
-    with connect(db_path) as conn:
-        for t in tables:
-            counts[t] = conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]  # noqa: S608
-    return counts
+    """Quick row counts for all tables, in one compound query."""
+    with connect(db_path, read_only=True) as conn:
+        return {t: c for t, c in conn.execute(_TABLE_COUNTS_SQL).fetchall()}
@@ -29,7 +29,8 @@ def build_growth_prediction_dataset(
     val_size: float = DEFAULT_VAL_SIZE,
     seed: int = DEFAULT_SEED,
     save: bool = True,
-) -> dict[str, pd.DataFrame | np.ndarray]:
+    return_arrays: bool = True,
+) -> dict[str, Any]:
     """
     Build the (X, y) dataset for growth prediction.
 
@@ -38,8 +39,13 @@ def build_growth_prediction_dataset(
     y = binary growth label.
 
     Returns dict with keys: X_train, X_val, X_test, y_train, y_val, y_test,
-    plus metadata DataFrames.
+    plus metadata DataFrames.  With ``return_arrays=False`` (requires
+    ``save``) the split arrays are written and released, and ``paths`` maps
+    each split name to its ``.npy`` file for ``np.load(..., mmap_mode="r")``.
     """
+    if not (save or return_arrays):
+        raise ValueError("return_arrays=False requires save=True")
+
     log.info("Building growth-prediction dataset...")
 
     # 1. Composition matrix  (media × ingredients)
@@ -52,49 +58,53 @@ def build_growth_prediction_dataset(
     if growth_mat.empty:
         raise ValueError("No growth observations found — run the ingest pipeline first.")
 
-    # 3. Flatten into (strain, media, label) rows
-    overlapping_media = list(set(growth_mat.columns) & set(comp_scaled.index))
+    # 3. Flatten into (strain, media, label) rows — strain-major cross-join
+    overlapping_media = growth_mat.columns.intersection(comp_scaled.index)
     log.info("Overlapping media between composition and growth: %d", len(overlapping_media))
 
-    rows: list[dict[str, Any]] = []
-    for strain_id in growth_mat.index:
-        for media_id in overlapping_media:
-            rows.append(
-                {
-                    "strain_id": strain_id,
-                    "media_id": media_id,
-                    "label": int(growth_mat.loc[strain_id, media_id]),
-                }
-            )
-
-    samples = pd.DataFrame(rows)
+    labels = growth_mat[overlapping_media].to_numpy(dtype=np.int8)
+    # media_id as codes into overlapping_media: no per-sample string objects
+    media_codes = np.tile(np.arange(len(overlapping_media)), len(growth_mat))
+    samples = pd.DataFrame(
+        {
+            "strain_id": np.repeat(growth_mat.index.to_numpy(), len(overlapping_media)),
+            "media_id": pd.Categorical.from_codes(media_codes, categories=overlapping_media),
+            "label": labels.ravel(),
+        }
+    )
     log.info("Total samples: %d  (positive=%.1f%%)", len(samples), samples["label"].mean() * 100)
 
-    # 4. Attach composition features
-    X = np.stack([comp_scaled.loc[mid].values for mid in samples["media_id"]])
-    y = samples["label"].values
+    # 4. Attach composition features — resolve each medium's row once, then
+    #    gather positionally instead of a label lookup per sample
+    rows = comp_scaled.index.get_indexer(overlapping_media)
+    X = comp_scaled.to_numpy()[rows[media_codes]]
+    y = samples["label"].to_numpy()
 
-    # 5. Split: train / val / test  (stratified)
-    X_temp, X_test, y_temp, y_test, idx_temp, idx_test = train_test_split(
-        X, y, samples.index, test_size=test_size, random_state=seed, stratify=y,
+    # 5. Split: train / val / test  (stratified) — split positions only,
+    #    then gather each feature block once
+    idx_temp, idx_test = train_test_split(
+        np.arange(len(y)), test_size=test_size, random_state=seed, stratify=y,
     )
     relative_val = val_size / (1 - test_size)
-    X_train, X_val, y_train, y_val, idx_train, idx_val = train_test_split(
-        X_temp, y_temp, idx_temp, test_size=relative_val, random_state=seed, stratify=y_temp,
+    idx_train, idx_val = train_test_split(
+        idx_temp, test_size=relative_val, random_state=seed, stratify=y[idx_temp],
     )
+    splits = {
+        "X_train": X[idx_train],
+        "X_val": X[idx_val],
+        "X_test": X[idx_test],
+        "y_train": y[idx_train],
+        "y_val": y[idx_val],
+        "y_test": y[idx_test],
+    }
+    del X  # only the partitions are needed from here on
 
     log.info(
         "Split sizes — train: %d  val: %d  test: %d",
-        len(X_train), len(X_val), len(X_test),
+        len(idx_train), len(idx_val), len(idx_test),
     )
 
-    result = {
-        "X_train": X_train,
-        "X_val": X_val,
-        "X_test": X_test,
-        "y_train": y_train,
-        "y_val": y_val,
-        "y_test": y_test,
+    result: dict[str, Any] = {
         "samples": samples,
         "composition_df": comp_scaled,
         "idx_map": idx_map,
@@ -103,13 +113,14 @@ def build_growth_prediction_dataset(
     if save:
         out = PROCESSED_DIR / "growth_prediction"
         out.mkdir(parents=True, exist_ok=True)
-        np.save(out / "X_train.npy", X_train)
-        np.save(out / "X_val.npy", X_val)
-        np.save(out / "X_test.npy", X_test)
-        np.save(out / "y_train.npy", y_train)
-        np.save(out / "y_val.npy", y_val)
-        np.save(out / "y_test.npy", y_test)
+        paths = {}
+        for name, arr in splits.items():
+            paths[name] = out / f"{name}.npy"
+            np.save(paths[name], arr)
         samples.to_parquet(out / "samples.parquet")
         log.info("Saved processed dataset to %s", out)
+        result["paths"] = paths
 
+    if return_arrays:
+        result.update(splits)
     return result
@@ -14,7 +14,7 @@ from typing import Any
 import numpy as np
 import pandas as pd
 
-from src.db.queries import get_all_ingredients, get_full_composition_matrix
+from src.db.queries import get_full_composition_columns, get_ingredient_ids
 
 log = logging.getLogger(__name__)
 
@@ -25,10 +25,10 @@ def build_ingredient_index(db_path: Any = None) -> dict[int, int]:
 
     Returns
     -------
-    dict mapping raw ingredient_id to a sequential integer index.
+    dict mapping raw ingredient_id to a sequential integer index, in
+    ascending ingredient_id order.
     """
-    ingredients = get_all_ingredients(db_path)
-    return {ing["ingredient_id"]: i for i, ing in enumerate(sorted(ingredients, key=lambda x: x["ingredient_id"]))}
+    return {iid: i for i, iid in enumerate(get_ingredient_ids(db_path))}
 
 
 def build_composition_matrix(db_path: Any = None) -> tuple[pd.DataFrame, list[str], dict[int, int]]:
@@ -48,22 +48,29 @@ def build_composition_matrix(db_path: Any = None) -> tuple[pd.DataFrame, list[st
     idx_map = build_ingredient_index(db_path)
     n_ingredients = len(idx_map)
 
-    triples = get_full_composition_matrix(db_path)
-    log.info("Building composition matrix from %d triples across %d ingredients", len(triples), n_ingredients)
-
-    # Group by media_id
-    media_dict: dict[str, np.ndarray] = {}
-    for row in triples:
-        mid = row["media_id"]
-        if mid not in media_dict:
-            media_dict[mid] = np.zeros(n_ingredients, dtype=np.float32)
-        col = idx_map.get(row["ingredient_id"])
-        if col is not None:
-            val = row["g_per_l"]
-            media_dict[mid][col] = val if val is not None else 0.0
-
-    media_ids = sorted(media_dict.keys())
-    matrix = np.stack([media_dict[m] for m in media_ids])
+    cols = get_full_composition_columns(db_path)
+    log.info(
+        "Building composition matrix from %d triples across %d ingredients",
+        len(cols["media_id"]), n_ingredients,
+    )
+
+    # Row per distinct medium (sorted), column via idx_map; one scatter instead of a row loop
+    media_arr, rows = np.unique(np.asarray(cols["media_id"], dtype=str), return_inverse=True)
+    media_ids = media_arr.tolist()
+
+    # idx_map is in ascending ID order, so an ID's column is its sorted position
+    known_ids = np.fromiter(idx_map, dtype=np.int64, count=n_ingredients)
+    ing = np.asarray(cols["ingredient_id"], dtype=np.int64)
+    pos = np.clip(np.searchsorted(known_ids, ing), 0, max(n_ingredients - 1, 0))
+    hit = known_ids[pos] == ing if n_ingredients else np.zeros(len(ing), dtype=bool)
+
+    vals = np.asarray(cols["g_per_l"], dtype=np.float32)  # NULL → NaN
+    vals[np.isnan(vals)] = 0.0
+
+    # Unbuffered add, so duplicate (medium, ingredient) pairs sum rather than
+    # last-write-wins (the table's primary key rules them out today)
+    matrix = np.zeros((len(media_ids), n_ingredients), dtype=np.float32)
+    np.add.at(matrix, (rows[hit], pos[hit]), vals[hit])
 
     df = pd.DataFrame(matrix, index=media_ids)
     df.index.name = "media_id"
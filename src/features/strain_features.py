@@ -15,7 +15,7 @@ from typing import Any
 import numpy as np
 import pandas as pd
 
-from src.db.queries import get_all_growth, get_all_media
+from src.db.queries import get_all_growth_columns, get_all_media
 
 log = logging.getLogger(__name__)
 
@@ -28,19 +28,23 @@ def build_strain_growth_matrix(db_path: Any = None) -> pd.DataFrame:
     -------
     pd.DataFrame with strain_id as index, media_id as columns, values {0, 1}.
     """
-    growth = get_all_growth(db_path)
-    log.info("Building strain-growth matrix from %d observations", len(growth))
+    growth = get_all_growth_columns(db_path)
+    log.info("Building strain-growth matrix from %d observations", len(growth["strain_id"]))
 
-    df = pd.DataFrame(growth)
-    if df.empty:
+    if not growth["strain_id"]:
         return pd.DataFrame()
 
-    pivot = df.pivot_table(
-        index="strain_id",
-        columns="media_id",
-        values="growth",
-        aggfunc="max",
-        fill_value=0,
+    # Scatter labels straight into an int8 grid (max over duplicate pairs)
+    # instead of pivot_table's groupby + int64 reshape
+    rows, strains = pd.factorize(pd.Series(growth["strain_id"]), sort=True)
+    cols, media = pd.factorize(pd.Series(growth["media_id"]), sort=True)
+    grid = np.zeros((len(strains), len(media)), dtype=np.int8)
+    np.maximum.at(grid, (rows, cols), np.asarray(growth["growth"], dtype=np.int8))
+
+    pivot = pd.DataFrame(
+        grid,
+        index=pd.Index(strains, name="strain_id"),
+        columns=pd.Index(media, name="media_id"),
     )
     log.info("Growth matrix shape: %s", pivot.shape)
     return pivot
@@ -56,35 +60,28 @@ def strain_summary_features(db_path: Any = None) -> pd.DataFrame:
     - growth_rate    : fraction of tested media with growth
     - pct_complex    : fraction of successful media that are complex
     """
-    growth = get_all_growth(db_path)
-    media_list = get_all_media(db_path)
-    media_is_complex = {m["media_id"]: bool(m["is_complex"]) for m in media_list}
-
-    records: list[dict[str, Any]] = []
-    # Group by strain
-    strain_map: dict[int, list[dict]] = {}
-    for g in growth:
-        strain_map.setdefault(g["strain_id"], []).append(g)
-
-    for sid, obs in strain_map.items():
-        tested = len(obs)
-        grew = [o for o in obs if o["growth"]]
-        n_grew = len(grew)
-        pct_complex = (
-            np.mean([1 if media_is_complex.get(o["media_id"]) else 0 for o in grew])
-            if n_grew > 0
-            else 0.0
-        )
-        records.append(
-            {
-                "strain_id": sid,
-                "n_media_tested": tested,
-                "n_media_grew": n_grew,
-                "growth_rate": n_grew / tested if tested else 0.0,
-                "pct_complex": pct_complex,
-            }
-        )
-
-    df = pd.DataFrame(records).set_index("strain_id")
+    df = pd.DataFrame(get_all_growth_columns(db_path))
+    complex_media = {m["media_id"] for m in get_all_media(db_path) if m["is_complex"]}
+
+    grew = df["growth"].astype(bool)
+    per_strain = pd.DataFrame(
+        {
+            "strain_id": df["strain_id"],
+            "grew": grew,
+            "grew_complex": grew & df["media_id"].isin(complex_media),
+        }
+    ).groupby("strain_id")
+
+    # One grouped pass; every strain has ≥ 1 observation so tested is never 0
+    df = per_strain.agg(
+        n_media_tested=("grew", "size"),
+        n_media_grew=("grew", "sum"),
+        n_grew_complex=("grew_complex", "sum"),
+    )
+    df["growth_rate"] = df["n_media_grew"] / df["n_media_tested"]
+    df["pct_complex"] = (df.pop("n_grew_complex") / df["n_media_grew"]).where(
+        df["n_media_grew"] > 0, 0.0
+    )
+
     log.info("Strain summary features: %d strains", len(df))
     return df
@@ -0,0 +1,142 @@
+"""
+Shared driver for the per-ID detail ingest steps.
+
+Steps 2, 4, 6, 7 and 8 all have the same shape: fetch one detail endpoint
+per ID, persist the payload, and record the outcome in ``ingest_log``.
+This module owns that loop so each fetcher only has to describe how to
+store its payload.
+
+HTTP requests fan out over a thread pool (``get_details``) while all
+SQLite writes happen on the calling thread: rows and their ``ingest_log``
+entries are written on one connection and committed every
+``INGEST_BATCH_SIZE`` IDs in one ``BEGIN IMMEDIATE`` transaction, so a
+step costs a handful of fsyncs instead of one per ID while staying
+resumable after a crash.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from src.api.client import get_detail, get_details
+from src.config import INGEST_BATCH_SIZE
+from src.db.queries import IngestLog, begin_immediate, connect, is_task_done
+
+log = logging.getLogger(__name__)
+
+# store(conn, key, data) -> number of rows worth reporting
+StoreFn = Callable[[sqlite3.Connection, Any, Any], int]
+
+# Solution tables are written from both /medium/:id and /solution/:id payloads
+SOLUTION_COLUMNS = ("solution_id", "solution_name", "volume_ml")
+STEP_COLUMNS = ("solution_id", "step_order", "step_text")
+RECIPE_COLUMNS = (
+    "solution_id",
+    "recipe_order",
+    "ingredient_id",
+    "ingredient_name",
+    "amount",
+    "unit",
+    "g_per_l",
+    "mmol_per_l",
+    "is_optional",
+    "condition",
+    "sub_solution_id",
+)
+
+
+def _store_result(
+    conn: sqlite3.Connection,
+    ingest_log: IngestLog,
+    key: Any,
+    task: str,
+    endpoint: str,
+    data: Any,
+    store: StoreFn,
+    fail_level: int,
+) -> int:
+    """Persist one fetched payload (or its fetch error), buffering the task outcome."""
+    begin_immediate(conn)  # first result of a batch opens its transaction
+    if isinstance(data, Exception):
+        log.log(fail_level, "Failed to fetch %s: %s", endpoint, data)
+        ingest_log.error(task, str(data))
+        return 0
+
+    n = store(conn, key, data)
+    ingest_log.done(task)
+    return n
+
+
+def ingest_one(
+    key: Any,
+    *,
+    task_prefix: str,
+    endpoint: str,
+    store: StoreFn,
+    db_path: Any = None,
+    fail_level: int = logging.WARNING,
+) -> int:
+    """Fetch and store a single detail resource.  ``endpoint`` is a ``str.format`` template."""
+    task = f"{task_prefix}:{key}"
+    if is_task_done(task, db_path):
+        return 0
+
+    url = endpoint.format(key)
+    try:
+        data = get_detail(url)
+    except Exception as e:
+        data = e
+
+    with connect(db_path) as conn:
+        with IngestLog(conn) as ingest_log:
+            n = _store_result(conn, ingest_log, key, task, url, data, store, fail_level)
+        conn.commit()
+    return n
+
+
+def ingest_many(
+    keys: Sequence[Any],
+    *,
+    task_prefix: str,
+    endpoint: str,
+    store: StoreFn,
+    db_path: Any = None,
+    label: str = "item",
+    log_every: int = 100,
+    fail_level: int = logging.WARNING,
+) -> int:
+    """
+    Fetch and store a detail resource for every key.
+
+    *keys* should already exclude finished tasks — see ``get_pending_ids``.
+    Fetches run concurrently; results are stored as they complete.
+    Returns the summed row counts reported by ``store``.
+    """
+    total = 0
+    with connect(db_path) as conn:
+        ingest_log = IngestLog(conn)
+        for i, (key, data) in enumerate(get_details(keys, endpoint)):
+            if (i + 1) % log_every == 0 or i == 0:
+                log.info("  [%d/%d] %s %s", i + 1, len(keys), label, key)
+
+            task = f"{task_prefix}:{key}"
+            total += _store_result(
+                conn,
+                ingest_log,
+                key,
+                task,
+                endpoint.format(key),
+                data,
+                store,
+                fail_level,
+            )
+
+            if (i + 1) % INGEST_BATCH_SIZE == 0:
+                ingest_log.flush()
+                conn.commit()
+        ingest_log.flush()
+        conn.commit()
+    return total
@@ -10,11 +10,24 @@ from __future__ import annotations
 
 import logging
 
-from src.api.client import paginate
-from src.db.queries import connect, is_task_done, mark_task_done
+from src.api.client import iter_items
+from src.db.queries import bulk_insert, connect, is_task_done, log_task
 
 log = logging.getLogger(__name__)
 
+_INGREDIENT_COLUMNS = (
+    "ingredient_id",
+    "ingredient_name",
+    "chebi_id",
+    "cas_rn",
+    "pubchem_id",
+    "molar_mass",
+    "formula",
+    "density",
+)
+# API keys for the optional columns, in _INGREDIENT_COLUMNS order after id/name
+_INGREDIENT_FIELDS = ("ChEBI", "CAS-RN", "PubChem", "mass", "formula", "density")
+
 
 def fetch_ingredient_list(db_path=None) -> int:
     """Fetch all ingredients from the paginated /ingredients endpoint."""
@@ -24,32 +37,19 @@ def fetch_ingredient_list(db_path=None) -> int:
         with connect(db_path) as conn:
             return conn.execute("SELECT COUNT(*) FROM ingredients").fetchone()[0]
 
-    total = 0
     with connect(db_path) as conn:
-        for page in paginate("/ingredients", limit=200):
-            for ing in page:
-                conn.execute(
-                    """
-                    INSERT OR IGNORE INTO ingredients
-                        (ingredient_id, ingredient_name, chebi_id, cas_rn,
-                         pubchem_id, molar_mass, formula, density)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        ing["id"],
-                        ing["name"],
-                        ing.get("ChEBI"),
-                        ing.get("CAS-RN"),
-                        ing.get("PubChem"),
-                        ing.get("mass"),
-                        ing.get("formula"),
-                        ing.get("density"),
-                    ),
-                )
-            conn.commit()
-            total += len(page)
-
-    mark_task_done(task, db_path)
+        total = bulk_insert(
+            conn,
+            "ingredients",
+            _INGREDIENT_COLUMNS,
+            (
+                (ing["id"], ing["name"], *map(ing.get, _INGREDIENT_FIELDS))
+                for ing in iter_items("/ingredients", limit=200)
+            ),
+        )
+        log_task(conn, task)
+        conn.commit()
+
     log.info("Fetched %d ingredients.", total)
     return total
 
@@ -11,12 +11,44 @@ Endpoints used:
 from __future__ import annotations
 
 import logging
-
-from src.api.client import get_detail, paginate
-from src.db.queries import connect, is_task_done, mark_task_done, mark_task_error
+import sqlite3
+from typing import Any
+
+from src.api.client import iter_items
+from src.db.queries import bulk_insert, connect, is_task_done, log_task
+from src.ingest.common import (
+    RECIPE_COLUMNS,
+    SOLUTION_COLUMNS,
+    STEP_COLUMNS,
+    ingest_many,
+    ingest_one,
+)
 
 log = logging.getLogger(__name__)
 
+# Statement parts are built once here; bulk_insert caches the SQL per shape
+# and the connection's statement cache keeps the prepared statements.
+_MEDIA_COLUMNS = (
+    "media_id", "media_name", "is_complex", "source", "link", "min_pH", "max_pH",
+    "reference", "description",
+)
+# API keys for the pass-through media columns (source .. description)
+_MEDIA_FIELDS = ("source", "link", "min_pH", "max_pH", "reference", "description")
+_COMPOSITION_COLUMNS = (
+    "media_id", "ingredient_id", "ingredient_name", "g_per_l", "mmol_per_l", "is_optional",
+)
+_STRAIN_COLUMNS = ("strain_id", "species", "ccno", "bacdive_id", "domain")
+_STRAIN_FIELDS = ("species", "ccno", "bacdive_id", "domain")
+_STRAIN_UPSERT = """
+    ON CONFLICT(strain_id) DO UPDATE SET
+        species   = COALESCE(excluded.species, strains.species),
+        ccno      = COALESCE(excluded.ccno, strains.ccno),
+        bacdive_id= COALESCE(excluded.bacdive_id, strains.bacdive_id),
+        domain    = COALESCE(excluded.domain, strains.domain)
+"""
+_GROWTH_COLUMNS = ("strain_id", "media_id", "growth")
+_MARK_DETAIL_SQL = "UPDATE media SET fetched_detail = 1 WHERE media_id = ?"
+
 
 # ═══════════════════════════════════════════════════════════════
 #  Step 1: Media list  (/media)
@@ -30,33 +62,19 @@ def fetch_media_list(db_path=None) -> int:
         with connect(db_path) as conn:
             return conn.execute("SELECT COUNT(*) FROM media").fetchone()[0]
 
-    total = 0
     with connect(db_path) as conn:
-        for page in paginate("/media", limit=200):
-            for m in page:
-                conn.execute(
-                    """
-                    INSERT OR IGNORE INTO media
-                        (media_id, media_name, is_complex, source, link, min_pH, max_pH,
-                         reference, description)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        str(m["id"]),
-                        m["name"],
-                        1 if m.get("complex_medium") else 0,
-                        m.get("source"),
-                        m.get("link"),
-                        m.get("min_pH"),
-                        m.get("max_pH"),
-                        m.get("reference"),
-                        m.get("description"),
-                    ),
-                )
-            conn.commit()
-            total += len(page)
+        total = bulk_insert(
+            conn,
+            "media",
+            _MEDIA_COLUMNS,
+            (
+                (str(m["id"]), m["name"], bool(m.get("complex_medium")), *map(m.get, _MEDIA_FIELDS))
+                for m in iter_items("/media", limit=200)
+            ),
+        )
+        log_task(conn, task)
+        conn.commit()
 
-    mark_task_done(task, db_path)
     log.info("Fetched %d media records.", total)
     return total
 
@@ -65,80 +83,69 @@ def fetch_media_list(db_path=None) -> int:
 #  Step 2: Medium detail — recipes + solutions  (/medium/:id)
 # ═══════════════════════════════════════════════════════════════
 
-def fetch_medium_detail(media_id: str, db_path=None) -> None:
-    """
-    Fetch the full recipe for one medium and persist solutions + recipe lines.
-    """
-    task = f"medium_detail:{media_id}"
-    if is_task_done(task, db_path):
-        return
-
-    try:
-        data = get_detail(f"/medium/{media_id}")
-    except Exception as e:
-        log.warning("Failed to fetch detail for medium %s: %s", media_id, e)
-        mark_task_error(task, str(e), db_path)
-        return
-
+def _store_medium_detail(conn: sqlite3.Connection, media_id: str, data: dict[str, Any]) -> int:
+    """Persist solutions + recipe lines + steps for one medium.  Returns solution count."""
     solutions = data.get("solutions") or []
 
-    with connect(db_path) as conn:
-        for sol in solutions:
-            sol_id = sol["id"]
-            conn.execute(
-                """
-                INSERT OR IGNORE INTO solutions (solution_id, solution_name, volume_ml)
-                VALUES (?, ?, ?)
-                """,
-                (sol_id, sol.get("name", ""), sol.get("volume")),
-            )
-            conn.execute(
-                "INSERT OR IGNORE INTO media_solutions (media_id, solution_id) VALUES (?, ?)",
-                (media_id, sol_id),
-            )
+    solution_rows = []
+    recipe_rows = []
+    step_rows = []
+    for sol in solutions:
+        sol_id = sol["id"]
+        solution_rows.append((sol_id, sol.get("name", ""), sol.get("volume")))
 
-            # Recipe lines
-            for item in sol.get("recipe") or []:
-                conn.execute(
-                    """
-                    INSERT OR IGNORE INTO solution_recipe
-                        (solution_id, recipe_order, ingredient_id, ingredient_name,
-                         amount, unit, g_per_l, mmol_per_l, is_optional,
-                         condition, sub_solution_id)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        sol_id,
-                        item.get("recipe_order", 0),
-                        item.get("compound_id"),
-                        item.get("compound", ""),
-                        item.get("amount"),
-                        item.get("unit"),
-                        item.get("g_l"),
-                        item.get("mmol_l"),
-                        1 if item.get("optional") else 0,
-                        item.get("condition"),
-                        item.get("solution_id"),  # sub-solution reference
-                    ),
+        # Recipe lines
+        for item in sol.get("recipe") or []:
+            recipe_rows.append(
+                (
+                    sol_id,
+                    item.get("recipe_order", 0),
+                    item.get("compound_id"),
+                    item.get("compound", ""),
+                    item.get("amount"),
+                    item.get("unit"),
+                    item.get("g_l"),
+                    item.get("mmol_l"),
+                    bool(item.get("optional")),
+                    item.get("condition"),
+                    item.get("solution_id"),  # sub-solution reference
                 )
+            )
 
-            # Preparation steps
-            for i, step in enumerate(sol.get("steps") or []):
-                conn.execute(
-                    """
-                    INSERT OR IGNORE INTO solution_steps (solution_id, step_order, step_text)
-                    VALUES (?, ?, ?)
-                    """,
-                    (sol_id, i + 1, step.get("step", "")),
-                )
+        # Preparation steps
+        for i, step in enumerate(sol.get("steps") or []):
+            step_rows.append((sol_id, i + 1, step.get("step", "")))
+
+    bulk_insert(conn, "solutions", SOLUTION_COLUMNS, solution_rows)
+    bulk_insert(
+        conn,
+        "media_solutions",
+        ("media_id", "solution_id"),
+        [(media_id, row[0]) for row in solution_rows],
+    )
+    bulk_insert(
+        conn,
+        "solution_recipe",
+        RECIPE_COLUMNS,
+        recipe_rows,
+    )
+    bulk_insert(conn, "solution_steps", STEP_COLUMNS, step_rows)
+
+    conn.execute(_MARK_DETAIL_SQL, (media_id,))
+    return len(solutions)
 
-        conn.execute(
-            "UPDATE media SET fetched_detail = 1 WHERE media_id = ?",
-            (media_id,),
-        )
-        conn.commit()
 
-    mark_task_done(task, db_path)
+def fetch_medium_detail(media_id: str, db_path=None) -> None:
+    """
+    Fetch the full recipe for one medium and persist solutions + recipe lines.
+    """
+    ingest_one(
+        media_id,
+        task_prefix="medium_detail",
+        endpoint="/medium/{}",
+        store=_store_medium_detail,
+        db_path=db_path,
+    )
 
 
 def fetch_all_medium_details(db_path=None) -> int:
@@ -148,10 +155,15 @@ def fetch_all_medium_details(db_path=None) -> int:
     ids = get_media_ids_without_detail(db_path)
     log.info("Fetching detail for %d media...", len(ids))
 
-    for i, mid in enumerate(ids):
-        if (i + 1) % 50 == 0 or i == 0:
-            log.info("  [%d/%d] medium %s", i + 1, len(ids), mid)
-        fetch_medium_detail(mid, db_path)
+    ingest_many(
+        ids,
+        task_prefix="medium_detail",
+        endpoint="/medium/{}",
+        store=_store_medium_detail,
+        db_path=db_path,
+        label="medium",
+        log_every=50,
+    )
 
     log.info("Medium detail fetch complete.")
     return len(ids)
@@ -161,56 +173,54 @@ def fetch_all_medium_details(db_path=None) -> int:
 #  Step 3: Molecular composition  (/medium-composition/:id)
 # ═══════════════════════════════════════════════════════════════
 
-def fetch_medium_composition(media_id: str, db_path=None) -> int:
-    """Fetch and store the flattened molecular composition for one medium."""
-    task = f"composition:{media_id}"
-    if is_task_done(task, db_path):
-        return 0
-
-    try:
-        data = get_detail(f"/medium-composition/{media_id}")
-    except Exception as e:
-        log.warning("Failed to fetch composition for medium %s: %s", media_id, e)
-        mark_task_error(task, str(e), db_path)
-        return 0
-
+def _store_medium_composition(conn: sqlite3.Connection, media_id: str, data: Any) -> int:
+    """Persist the flattened molecular composition for one medium."""
     # data is a list of ingredient dicts
     items = data if isinstance(data, list) else []
-    with connect(db_path) as conn:
-        for item in items:
-            conn.execute(
-                """
-                INSERT OR IGNORE INTO media_composition
-                    (media_id, ingredient_id, ingredient_name, g_per_l, mmol_per_l, is_optional)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    media_id,
-                    item["id"],
-                    item.get("name", ""),
-                    item.get("g_l"),
-                    item.get("mmol_l"),
-                    1 if item.get("optional") else 0,
-                ),
+    return bulk_insert(
+        conn,
+        "media_composition",
+        _COMPOSITION_COLUMNS,
+        [
+            (
+                media_id,
+                item["id"],
+                item.get("name", ""),
+                item.get("g_l"),
+                item.get("mmol_l"),
+                bool(item.get("optional")),
             )
-        conn.commit()
+            for item in items
+        ],
+    )
+
 
-    mark_task_done(task, db_path)
-    return len(items)
+def fetch_medium_composition(media_id: str, db_path=None) -> int:
+    """Fetch and store the flattened molecular composition for one medium."""
+    return ingest_one(
+        media_id,
+        task_prefix="composition",
+        endpoint="/medium-composition/{}",
+        store=_store_medium_composition,
+        db_path=db_path,
+    )
 
 
 def fetch_all_compositions(db_path=None) -> int:
     """Fetch composition for every medium."""
-    from src.db.queries import get_media_ids
+    from src.db.queries import get_pending_ids
 
-    ids = get_media_ids(db_path)
+    ids = get_pending_ids("media", "media_id", "composition", db_path)
     log.info("Fetching compositions for %d media...", len(ids))
-    total = 0
 
-    for i, mid in enumerate(ids):
-        if (i + 1) % 100 == 0 or i == 0:
-            log.info("  [%d/%d] composition for %s", i + 1, len(ids), mid)
-        total += fetch_medium_composition(mid, db_path)
+    total = ingest_many(
+        ids,
+        task_prefix="composition",
+        endpoint="/medium-composition/{}",
+        store=_store_medium_composition,
+        db_path=db_path,
+        label="composition for",
+    )
 
     log.info("Composition fetch complete: %d rows.", total)
     return total
@@ -220,68 +230,54 @@ def fetch_all_compositions(db_path=None) -> int:
 #  Step 4: Strain associations  (/medium-strains/:id)
 # ═══════════════════════════════════════════════════════════════
 
-def fetch_medium_strains(media_id: str, db_path=None) -> int:
-    """Fetch all strain–growth associations for one medium."""
-    task = f"medium_strains:{media_id}"
-    if is_task_done(task, db_path):
-        return 0
+def _store_medium_strains(conn: sqlite3.Connection, media_id: str, data: Any) -> int:
+    """Persist strain records + growth observations for one medium."""
+    items = data if isinstance(data, list) else []
 
-    try:
-        data = get_detail(f"/medium-strains/{media_id}")
-    except Exception as e:
-        log.warning("Failed to fetch strains for medium %s: %s", media_id, e)
-        mark_task_error(task, str(e), db_path)
-        return 0
+    # Upsert strains
+    bulk_insert(
+        conn,
+        "strains",
+        _STRAIN_COLUMNS,
+        [(s["id"], *map(s.get, _STRAIN_FIELDS)) for s in items],
+        conflict="",
+        upsert=_STRAIN_UPSERT,
+    )
+    # Growth observations
+    return bulk_insert(
+        conn,
+        "strain_growth",
+        _GROWTH_COLUMNS,
+        [(s["id"], media_id, bool(s.get("growth"))) for s in items],
+    )
 
-    items = data if isinstance(data, list) else []
-    with connect(db_path) as conn:
-        for s in items:
-            # Upsert strain
-            conn.execute(
-                """
-                INSERT INTO strains (strain_id, species, ccno, bacdive_id, domain)
-                VALUES (?, ?, ?, ?, ?)
-                ON CONFLICT(strain_id) DO UPDATE SET
-                    species   = COALESCE(excluded.species, strains.species),
-                    ccno      = COALESCE(excluded.ccno, strains.ccno),
-                    bacdive_id= COALESCE(excluded.bacdive_id, strains.bacdive_id),
-                    domain    = COALESCE(excluded.domain, strains.domain)
-                """,
-                (
-                    s["id"],
-                    s.get("species"),
-                    s.get("ccno"),
-                    s.get("bacdive_id"),
-                    s.get("domain"),
-                ),
-            )
-            # Growth observation
-            conn.execute(
-                """
-                INSERT OR IGNORE INTO strain_growth
-                    (strain_id, media_id, growth)
-                VALUES (?, ?, ?)
-                """,
-                (s["id"], media_id, 1 if s.get("growth") else 0),
-            )
-        conn.commit()
 
-    mark_task_done(task, db_path)
-    return len(items)
+def fetch_medium_strains(media_id: str, db_path=None) -> int:
+    """Fetch all strain–growth associations for one medium."""
+    return ingest_one(
+        media_id,
+        task_prefix="medium_strains",
+        endpoint="/medium-strains/{}",
+        store=_store_medium_strains,
+        db_path=db_path,
+    )
 
 
 def fetch_all_medium_strains(db_path=None) -> int:
     """Fetch strain associations for every medium."""
-    from src.db.queries import get_media_ids
+    from src.db.queries import get_pending_ids
 
-    ids = get_media_ids(db_path)
+    ids = get_pending_ids("media", "media_id", "medium_strains", db_path)
     log.info("Fetching strain associations for %d media...", len(ids))
-    total = 0
 
-    for i, mid in enumerate(ids):
-        if (i + 1) % 100 == 0 or i == 0:
-            log.info("  [%d/%d] strains for %s", i + 1, len(ids), mid)
-        total += fetch_medium_strains(mid, db_path)
+    total = ingest_many(
+        ids,
+        task_prefix="medium_strains",
+        endpoint="/medium-strains/{}",
+        store=_store_medium_strains,
+        db_path=db_path,
+        label="strains for",
+    )
 
     log.info("Strain-growth fetch complete: %d associations.", total)
     return total
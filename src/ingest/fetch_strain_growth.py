@@ -13,12 +13,64 @@ extra fields (growth_rate, growth_quality, modification).
 from __future__ import annotations
 
 import logging
+import sqlite3
+from typing import Any
 
-from src.api.client import get_detail
-from src.db.queries import connect, is_task_done, mark_task_done, mark_task_error
+from src.db.queries import bulk_insert, get_pending_ids
+from src.ingest.common import ingest_many, ingest_one
 
 log = logging.getLogger(__name__)
 
+_UPSERT_STRAIN_SQL = """
+    INSERT INTO strains (strain_id, species, ccno)
+    VALUES (?, ?, ?)
+    ON CONFLICT(strain_id) DO UPDATE SET
+        species = COALESCE(excluded.species, strains.species),
+        ccno    = COALESCE(excluded.ccno, strains.ccno)
+"""
+_GROWTH_COLUMNS = (
+    "strain_id",
+    "media_id",
+    "growth",
+    "growth_rate",
+    "growth_quality",
+    "modification",
+)
+_GROWTH_UPSERT = """
+    ON CONFLICT(strain_id, media_id) DO UPDATE SET
+        growth_rate    = COALESCE(excluded.growth_rate, strain_growth.growth_rate),
+        growth_quality = COALESCE(excluded.growth_quality, strain_growth.growth_quality),
+        modification   = COALESCE(excluded.modification, strain_growth.modification)
+"""
+
+
+def _store_strain_detail(conn: sqlite3.Connection, strain_id: int, data: dict[str, Any]) -> int:
+    """Upsert one strain record and its per-medium growth observations."""
+    # Upsert strain metadata
+    conn.execute(_UPSERT_STRAIN_SQL, (data["id"], data.get("species"), data.get("ccno")))
+
+    # Growth observations from this strain's perspective
+    media_list = data.get("media") or []
+    bulk_insert(
+        conn,
+        "strain_growth",
+        _GROWTH_COLUMNS,
+        [
+            (
+                strain_id,
+                str(m["medium_id"]),
+                bool(m.get("growth")),
+                m.get("growth_rate"),
+                m.get("growth_quality"),
+                m.get("modification"),
+            )
+            for m in media_list
+        ],
+        conflict="",
+        upsert=_GROWTH_UPSERT,
+    )
+    return len(media_list)
+
 
 def fetch_strain_detail(strain_id: int, db_path=None) -> int:
     """
@@ -28,70 +80,32 @@ def fetch_strain_detail(strain_id: int, db_path=None) -> int:
     not already present (including growth_rate / growth_quality).
     Returns count of growth rows processed.
     """
-    task = f"strain_detail:{strain_id}"
-    if is_task_done(task, db_path):
-        return 0
-
-    try:
-        data = get_detail(f"/strain/id/{strain_id}")
-    except Exception as e:
-        log.debug("Failed to fetch strain %d: %s", strain_id, e)
-        mark_task_error(task, str(e), db_path)
-        return 0
-
-    with connect(db_path) as conn:
-        # Upsert strain metadata
-        conn.execute(
-            """
-            INSERT INTO strains (strain_id, species, ccno)
-            VALUES (?, ?, ?)
-            ON CONFLICT(strain_id) DO UPDATE SET
-                species = COALESCE(excluded.species, strains.species),
-                ccno    = COALESCE(excluded.ccno, strains.ccno)
-            """,
-            (data["id"], data.get("species"), data.get("ccno")),
-        )
-
-        # Growth observations from this strain's perspective
-        media_list = data.get("media") or []
-        for m in media_list:
-            conn.execute(
-                """
-                INSERT INTO strain_growth
-                    (strain_id, media_id, growth, growth_rate, growth_quality, modification)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ON CONFLICT(strain_id, media_id) DO UPDATE SET
-                    growth_rate    = COALESCE(excluded.growth_rate, strain_growth.growth_rate),
-                    growth_quality = COALESCE(excluded.growth_quality, strain_growth.growth_quality),
-                    modification   = COALESCE(excluded.modification, strain_growth.modification)
-                """,
-                (
-                    strain_id,
-                    str(m["medium_id"]),
-                    1 if m.get("growth") else 0,
-                    m.get("growth_rate"),
-                    m.get("growth_quality"),
-                    m.get("modification"),
-                ),
-            )
-        conn.commit()
-
-    mark_task_done(task, db_path)
-    return len(media_list)
+    return ingest_one(
+        strain_id,
+        task_prefix="strain_detail",
+        endpoint="/strain/id/{}",
+        store=_store_strain_detail,
+        db_path=db_path,
+        fail_level=logging.DEBUG,
+    )
 
 
 def fetch_all_strain_details(db_path=None) -> int:
     """Fetch detail for every strain already discovered in the DB."""
-    with connect(db_path) as conn:
-        ids = [r[0] for r in conn.execute("SELECT strain_id FROM strains").fetchall()]
+    ids = get_pending_ids("strains", "strain_id", "strain_detail", db_path)
 
     log.info("Fetching detail for %d strains...", len(ids))
-    total = 0
 
-    for i, sid in enumerate(ids):
-        if (i + 1) % 500 == 0 or i == 0:
-            log.info("  [%d/%d] strain %d", i + 1, len(ids), sid)
-        total += fetch_strain_detail(sid, db_path)
+    total = ingest_many(
+        ids,
+        task_prefix="strain_detail",
+        endpoint="/strain/id/{}",
+        store=_store_strain_detail,
+        db_path=db_path,
+        label="strain",
+        log_every=500,
+        fail_level=logging.DEBUG,
+    )
 
     log.info("Strain detail fetch complete: %d growth observations enriched.", total)
     return total
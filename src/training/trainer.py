@@ -48,12 +48,8 @@ def load_processed_dataset(base: Path | None = None) -> dict[str, np.ndarray]:
     """Load pre-built .npy arrays from the processed directory."""
     d = base or (PROCESSED_DIR / "growth_prediction")
     return {
-        "X_train": np.load(d / "X_train.npy"),
-        "X_val": np.load(d / "X_val.npy"),
-        "X_test": np.load(d / "X_test.npy"),
-        "y_train": np.load(d / "y_train.npy"),
-        "y_val": np.load(d / "y_val.npy"),
-        "y_test": np.load(d / "y_test.npy"),
+        name: np.load(d / f"{name}.npy")
+        for name in ("X_train", "X_val", "X_test", "y_train", "y_val", "y_test")
     }
 
 
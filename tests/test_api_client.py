@@ -1,10 +1,25 @@
 """Tests for the API client module."""
 
+import hashlib
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from src.api.client import get
+from src.api.client import (
+    RateLimiter,
+    _cache_key,
+    get,
+    get_cached,
+    get_details,
+    iter_items,
+    paginate,
+    paginate_bulk,
+)
 
 
 @pytest.mark.unit
@@ -12,20 +27,34 @@ class TestApiClient:
     """Tests for src.api.client.get()."""
 
     @patch("src.api.client._get_session")
-    @patch("src.api.client.time.sleep")
-    def test_get_returns_json(self, mock_sleep: MagicMock, mock_session: MagicMock) -> None:
+    @patch("src.api.client._limiter")
+    def test_get_returns_json(self, mock_limiter: MagicMock, mock_session: MagicMock) -> None:
         mock_response = MagicMock()
         mock_response.headers = {"Content-Type": "application/json"}
-        mock_response.json.return_value = {"data": [{"id": 1}]}
+        mock_response.content = b'{"data": [{"id": 1}]}'
         mock_response.raise_for_status = MagicMock()
         mock_session.return_value.get.return_value = mock_response
 
         result = get("/test")
 
         assert result == {"data": [{"id": 1}]}
-        mock_sleep.assert_called_once()
+        mock_limiter.wait.assert_called_once()
 
     @patch("src.api.client._get_session")
+    @patch("src.api.client._limiter")
+    def test_get_backs_off_on_429(self, mock_limiter: MagicMock, mock_session: MagicMock) -> None:
+        throttled = MagicMock(status_code=429, headers={"Retry-After": "3"})
+        ok = MagicMock(status_code=200, headers={"Content-Type": "application/json"})
+        ok.content = b'{"data": []}'
+        mock_session.return_value.get.side_effect = [throttled, ok]
+
+        assert get("/test") == {"data": []}
+        mock_limiter.pause.assert_called_once_with(3.0)
+        mock_limiter.slow_down.assert_called_once()
+        assert mock_limiter.wait.call_count == 2
+
+    @patch("src.api.client._get_session")
+    @patch("src.api.client._limiter", MagicMock())
     def test_get_raises_on_non_json(self, mock_session: MagicMock) -> None:
         mock_response = MagicMock()
         mock_response.headers = {"Content-Type": "text/html"}
@@ -35,3 +64,295 @@ class TestApiClient:
 
         with pytest.raises(RuntimeError, match="Expected JSON"):
             get("/test")
+
+
+@pytest.mark.unit
+class TestGetCached:
+    @staticmethod
+    def _response(status: int = 200, body: bytes = b"", etag: str | None = None) -> MagicMock:
+        headers = {"Content-Type": "application/json"}
+        if etag:
+            headers["ETag"] = etag
+        return MagicMock(status_code=status, headers=headers, content=body)
+
+    @patch("src.api.client._send")
+    def test_second_call_served_from_cache(self, mock_get: MagicMock, tmp_path: Path) -> None:
+        mock_get.return_value = self._response(body=b'{"data": {"id": 1, "name": "Glucose"}}')
+
+        with patch("src.api.client.RAW_DIR", tmp_path):
+            first = get_cached("/ingredient/1", {"limit": 1})
+            second = get_cached("/ingredient/1", {"limit": 1})
+
+        assert first == second == {"data": {"id": 1, "name": "Glucose"}}
+        mock_get.assert_called_once()
+
+    @patch("src.api.client._send")
+    def test_legacy_json_files_migrated(self, mock_get: MagicMock, tmp_path: Path) -> None:
+        cache_root = tmp_path / "api_cache"
+        cache_root.mkdir()
+        # File name as written by the original file-per-response cache
+        params = {"limit": 1}
+        legacy_key = hashlib.sha256(f"/medium/1|{sorted(params.items())}".encode()).hexdigest()[:16]
+        legacy = cache_root / f"{legacy_key}.json"
+        legacy.write_text('{\n  "data": {\n    "id": 1\n  }\n}')
+
+        with patch("src.api.client.RAW_DIR", tmp_path):
+            assert get_cached("/medium/1", params) == {"data": {"id": 1}}
+            assert not legacy.exists()
+            assert get_cached("/medium/1", params) == {"data": {"id": 1}}
+
+        mock_get.assert_not_called()
+
+    @patch("src.api.client.CACHE_MAX_AGE_DAYS", 1.0)
+    @patch("src.api.client._send")
+    def test_stale_entry_revalidated_with_etag(self, mock_get: MagicMock, tmp_path: Path) -> None:
+        mock_get.side_effect = [
+            self._response(body=b'{"data": {"id": 1}}', etag='"v1"'),
+            self._response(status=304),
+        ]
+
+        with patch("src.api.client.RAW_DIR", tmp_path):
+            get_cached("/medium/1")
+            with patch("src.api.client.time.time", return_value=time.time() + 2 * 86400):
+                assert get_cached("/medium/1") == {"data": {"id": 1}}
+
+        assert mock_get.call_args_list[1].args[2] == {"If-None-Match": '"v1"'}
+
+    def test_cache_key_ignores_param_order(self) -> None:
+        a = _cache_key("/media", {"limit": 200, "offset": 0})
+        b = _cache_key("/media", {"offset": 0, "limit": 200})
+        assert a == b
+        assert a != _cache_key("/media", {"limit": 200, "offset": 200})
+
+    def test_cache_key_memoizes_hashable_params(self) -> None:
+        _cache_key("/medium/7", {"limit": 1})
+        with patch("src.api.client.json.dumps") as mock_dumps:
+            _cache_key("/medium/7", {"limit": 1})
+        mock_dumps.assert_not_called()
+
+    def test_cache_key_accepts_unhashable_params(self) -> None:
+        a = _cache_key("/media", {"ids": [1, 2]})
+        assert a == _cache_key("/media", {"ids": [1, 2]})
+        assert a != _cache_key("/media", {"ids": [2, 1]})
+
+
+@pytest.mark.unit
+class TestPaginate:
+    @patch("src.api.client.get_cached")
+    def test_yields_pages_until_short_page(self, mock_get: MagicMock) -> None:
+        pages = {0: [{"id": 1}, {"id": 2}], 2: [{"id": 3}, {"id": 4}], 4: [{"id": 5}]}
+        mock_get.side_effect = lambda endpoint, params: {"data": pages[params["offset"]]}
+
+        out = list(paginate("/media", limit=2))
+
+        assert out == [pages[0], pages[2], pages[4]]
+        assert [c.args[1]["offset"] for c in mock_get.call_args_list] == [0, 2, 4]
+
+    @patch("src.api.client.get_cached")
+    def test_next_page_prefetched_before_yield(self, mock_get: MagicMock) -> None:
+        second_requested = threading.Event()
+
+        def fake(endpoint: str, params: dict) -> dict:
+            if params["offset"] == 1:
+                second_requested.set()
+            return {"data": [{"id": params["offset"]}]}
+
+        mock_get.side_effect = fake
+        pages = paginate("/media", limit=1)
+
+        next(pages)  # caller still holds page 0 ...
+        assert second_requested.wait(timeout=5)  # ... while page 1 is in flight
+        pages.close()
+
+
+@pytest.mark.unit
+class TestPaginateBulk:
+    @staticmethod
+    def _pages(count: int | None) -> dict[int, dict]:
+        pages = {0: [{"id": 1}, {"id": 2}], 2: [{"id": 3}, {"id": 4}], 4: [{"id": 5}]}
+        resp = {o: {"data": items} for o, items in pages.items()}
+        if count is not None:
+            for r in resp.values():
+                r["count"] = count
+        return resp
+
+    @patch("src.api.client.get_cached")
+    def test_uses_count_to_fetch_remaining_pages(self, mock_get: MagicMock) -> None:
+        resp = self._pages(count=5)
+        mock_get.side_effect = lambda endpoint, params: resp[params["offset"]]
+
+        out = [item["id"] for page in paginate_bulk("/media", limit=2) for item in page]
+
+        assert out == [1, 2, 3, 4, 5]
+        assert mock_get.call_count == 3
+
+    @patch("src.api.client.get_cached")
+    def test_falls_back_without_count(self, mock_get: MagicMock) -> None:
+        resp = self._pages(count=None)
+        mock_get.side_effect = lambda endpoint, params: resp[params["offset"]]
+
+        out = [item["id"] for page in paginate_bulk("/media", limit=2) for item in page]
+
+        assert out == [1, 2, 3, 4, 5]
+        assert mock_get.call_count == 3
+
+    @patch("src.api.client.get_cached")
+    def test_low_count_does_not_truncate(self, mock_get: MagicMock) -> None:
+        resp = self._pages(count=3)  # stale: 5 rows exist
+        mock_get.side_effect = lambda endpoint, params: resp[params["offset"]]
+
+        out = [item["id"] for page in paginate_bulk("/media", limit=2) for item in page]
+
+        assert out == [1, 2, 3, 4, 5]
+
+    @patch("src.api.client.get_cached")
+    def test_iter_items_uses_count(self, mock_get: MagicMock) -> None:
+        resp = self._pages(count=5)
+        mock_get.side_effect = lambda endpoint, params: resp[params["offset"]]
+
+        with patch("src.api.client.paginate") as mock_paginate:
+            assert [item["id"] for item in iter_items("/media", limit=2)] == [1, 2, 3, 4, 5]
+        mock_paginate.assert_not_called()
+
+
+@pytest.mark.unit
+class TestRateLimiter:
+    @patch("src.api.client.time.sleep")
+    @patch("src.api.client.time.monotonic", return_value=100.0)
+    def test_spaces_request_starts(self, mock_clock: MagicMock, mock_sleep: MagicMock) -> None:
+        limiter = RateLimiter(0.5)
+
+        for _ in range(3):
+            limiter.wait()
+
+        # first call goes straight through; the next two queue behind it
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [0.5, 1.0]
+
+    @patch("src.api.client.time.sleep")
+    @patch("src.api.client.time.monotonic", return_value=100.0)
+    def test_pause_delays_next_request(self, mock_clock: MagicMock, mock_sleep: MagicMock) -> None:
+        limiter = RateLimiter(0.5)
+
+        limiter.pause(4.0)
+        limiter.wait()
+
+        mock_sleep.assert_called_once_with(4.0)
+
+    def test_slow_down_then_recover(self) -> None:
+        limiter = RateLimiter(0.5)
+
+        limiter.slow_down()
+        limiter.slow_down()
+        assert limiter.interval == 2.0
+
+        for _ in range(50):
+            limiter.speed_up()
+        assert limiter.interval == 0.5  # never below the configured spacing
+
+    def test_slow_down_from_zero_interval(self) -> None:
+        limiter = RateLimiter(0.0)
+        limiter.slow_down()
+        assert limiter.interval == RateLimiter.min_backoff
+
+        for _ in range(100):
+            limiter.speed_up()
+        assert limiter.interval == 0.0
+
+
+@pytest.mark.unit
+class TestGetDetails:
+    @patch("src.api.client.get_detail")
+    def test_yields_data_and_errors_per_key(self, mock_detail: MagicMock) -> None:
+        def fake(endpoint: str, **kwargs: object) -> dict:
+            if endpoint.endswith("/2"):
+                raise ValueError("missing")
+            return {"endpoint": endpoint}
+
+        mock_detail.side_effect = fake
+
+        results = dict(get_details([1, 2, 3], "/medium/{}", max_workers=2))
+
+        assert results[1] == {"endpoint": "/medium/1"}
+        assert results[3] == {"endpoint": "/medium/3"}
+        assert isinstance(results[2], ValueError)
+
+    @patch("src.api.client.get_detail")
+    def test_window_bounds_outstanding_requests(self, mock_detail: MagicMock) -> None:
+        mock_detail.side_effect = lambda endpoint, **kwargs: {"endpoint": endpoint}
+        consumed = []
+
+        def keys():
+            for k in range(20):
+                consumed.append(k)
+                yield k
+
+        results = get_details(keys(), "/medium/{}", max_workers=2, window=3)
+        first = next(results)
+
+        assert len(consumed) <= 4  # initial window + one refill
+        rest = dict(results)
+        assert set(rest) | {first[0]} == set(range(20))
+
+
+@pytest.fixture
+def throttling_server() -> Iterator[tuple[str, list[int]]]:
+    """Loopback API answering 429 (Retry-After: 0) once, then JSON; yields (url, hit log)."""
+    hits: list[int] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            hits.append(len(hits))
+            if len(hits) == 1:
+                self.send_response(429)
+                self.send_header("Retry-After", "0")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = b'{"data": []}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}", hits
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.integration
+class TestSession:
+    """``_send`` through the real session and mounted ``HTTPAdapter``."""
+
+    @patch("src.api.client._limiter")
+    def test_429_reaches_send(
+        self, mock_limiter: MagicMock, throttling_server: tuple[str, list[int]]
+    ) -> None:
+        url, hits = throttling_server
+        with patch("src.api.client.BASE_URL", url), patch("src.api.client._session", None):
+            assert get("/test") == {"data": []}
+
+        # one 429 handed back by the adapter, one retry issued by _send
+        assert len(hits) == 2
+        mock_limiter.pause.assert_called_once_with(0.0)
+
+    def test_429_slows_shared_limiter(self, throttling_server: tuple[str, list[int]]) -> None:
+        url, _ = throttling_server
+        limiter = MagicMock(wraps=RateLimiter(0.0))
+        with (
+            patch("src.api.client.BASE_URL", url),
+            patch("src.api.client._session", None),
+            patch("src.api.client._limiter", limiter),
+        ):
+            get("/test")
+
+        limiter.slow_down.assert_called_once()
+        limiter.speed_up.assert_called_once()
@@ -1,17 +1,37 @@
 """Tests for DB initialization and query helpers."""
 
+import sqlite3
 from pathlib import Path
 
 import pytest
 
-from src.db.init_db import init_db
+from src.db.init_db import PAGE_SIZE, SCHEMA_PATH, _split_pragmas, init_db
+from src.db.maintenance import (
+    BULK_TABLES,
+    checkpoint_wal,
+    drop_bulk_indexes,
+    empty_tables,
+    rebuild_bulk_indexes,
+)
 from src.db.queries import (
+    MAX_SQL_PARAMS,
+    begin_immediate,
+    bulk_insert,
+    close_connections,
+    connect,
     get_all_growth,
+    get_all_growth_columns,
     get_all_ingredients,
     get_all_media,
+    get_full_composition_columns,
     get_full_composition_matrix,
+    get_ingredient_ids,
     get_ingredient_index,
     get_media_ids,
+    get_pending_ids,
+    mark_task_done,
+    mark_task_error,
+    mark_tasks_done,
     table_counts,
 )
 
@@ -23,6 +43,21 @@ class TestInitDb:
         init_db(db_path)
         assert db_path.exists()
 
+    def test_new_database_uses_wal_and_page_size(self, tmp_path: Path) -> None:
+        db_path = tmp_path / "new.db"
+        init_db(db_path)
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA page_size").fetchone()[0] == PAGE_SIZE
+        conn.close()
+
+    def test_schema_pragmas_run_outside_transaction(self) -> None:
+        pragmas, ddl = _split_pragmas(SCHEMA_PATH.read_text())
+        assert "journal_mode = WAL" in pragmas
+        assert "foreign_keys = ON" in pragmas
+        assert "PRAGMA" not in ddl.upper()
+        assert "CREATE TABLE" in ddl
+
     def test_schema_creates_tables(self, tmp_path: Path) -> None:
         db_path = tmp_path / "new.db"
         init_db(db_path)
@@ -59,6 +94,9 @@ class TestQueries:
         names = {i["ingredient_name"] for i in ingredients}
         assert "Glucose" in names
 
+    def test_get_ingredient_ids_sorted(self, tmp_db: Path) -> None:
+        assert get_ingredient_ids(tmp_db) == [1, 2, 3, 4, 5]
+
     def test_get_ingredient_index(self, tmp_db: Path) -> None:
         idx = get_ingredient_index(tmp_db)
         assert len(idx) == 5
@@ -72,6 +110,58 @@ class TestQueries:
         growth = get_all_growth(tmp_db)
         assert len(growth) == 6
 
+    def test_column_getters_match_row_getters(self, tmp_db: Path) -> None:
+        cols = get_full_composition_columns(tmp_db)
+        rows = get_full_composition_matrix(tmp_db)
+        assert list(cols) == ["media_id", "ingredient_id", "g_per_l"]
+        assert list(zip(*cols.values(), strict=True)) == [tuple(r.values()) for r in rows]
+
+        growth = get_all_growth_columns(tmp_db)
+        assert len(growth["strain_id"]) == 6
+
+    def test_connection_reused_and_uncommitted_work_discarded(self, tmp_db: Path) -> None:
+        with connect(tmp_db) as conn:
+            conn.execute("UPDATE media SET media_name = 'changed'")
+            with connect(tmp_db) as inner:
+                assert inner is conn
+                assert inner.in_transaction  # nested exit must not roll back
+        with connect(tmp_db) as again:
+            assert again is conn
+            names = {r[0] for r in again.execute("SELECT media_name FROM media")}
+            assert "changed" not in names
+
+        close_connections()
+        with connect(tmp_db) as fresh:
+            assert fresh is not conn
+
+    def test_close_connections_removes_wal_files(self, tmp_db: Path) -> None:
+        with connect(tmp_db) as conn:
+            conn.execute("UPDATE media SET media_name = 'changed'")
+            conn.commit()
+        with connect(tmp_db, read_only=True) as ro:  # opened last, as by table_counts
+            ro.execute("SELECT COUNT(*) FROM media").fetchone()
+        assert tmp_db.with_name(tmp_db.name + "-wal").exists()
+
+        close_connections()
+        assert not tmp_db.with_name(tmp_db.name + "-wal").exists()
+        assert not tmp_db.with_name(tmp_db.name + "-shm").exists()
+
+    def test_read_only_connection_rejects_writes(self, tmp_db: Path) -> None:
+        with connect(tmp_db, read_only=True) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM media").fetchone()[0] == 3
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM media")
+
+    def test_begin_immediate_takes_write_lock(self, tmp_db: Path) -> None:
+        with connect(tmp_db) as conn:
+            begin_immediate(conn)
+            begin_immediate(conn)  # already open: no nested BEGIN
+            assert conn.in_transaction
+            other = sqlite3.connect(tmp_db, timeout=0)
+            with pytest.raises(sqlite3.OperationalError, match="locked"):
+                other.execute("BEGIN IMMEDIATE")
+            other.close()
+
     def test_table_counts(self, tmp_db: Path) -> None:
         counts = table_counts(tmp_db)
         assert counts["media"] == 3
@@ -79,3 +169,99 @@ class TestQueries:
         assert counts["media_composition"] == 11
         assert counts["strain_growth"] == 6
         assert counts["strains"] == 2
+
+
+@pytest.mark.unit
+class TestIngestLog:
+    def test_pending_ids_excludes_done(self, tmp_db: Path) -> None:
+        mark_task_done("composition:M1", tmp_db)
+        mark_task_error("composition:M2", "timeout", tmp_db)
+        mark_task_done("medium_strains:M3", tmp_db)  # different task prefix
+
+        pending = get_pending_ids("media", "media_id", "composition", tmp_db)
+
+        assert set(pending) == {"M2", "M3"}
+
+    def test_mark_tasks_done_clears_errors(self, tmp_db: Path) -> None:
+        mark_task_error("composition:M2", "timeout", tmp_db)
+        mark_tasks_done(["composition:M1", "composition:M2"], tmp_db)
+
+        assert get_pending_ids("media", "media_id", "composition", tmp_db) == ["M3"]
+        with connect(tmp_db) as conn:
+            err = conn.execute(
+                "SELECT error_message FROM ingest_log WHERE task = 'composition:M2'"
+            ).fetchone()[0]
+        assert err is None
+
+    def test_pending_ids_integer_keys(self, tmp_db: Path) -> None:
+        mark_task_done("strain_detail:101", tmp_db)
+        assert get_pending_ids("strains", "strain_id", "strain_detail", tmp_db) == [102]
+
+
+@pytest.mark.unit
+class TestBulkInsert:
+    def test_chunks_past_param_limit(self, tmp_db: Path) -> None:
+        cols = ("ingredient_id", "ingredient_name")
+        rows = [(1000 + i, f"ing-{i}") for i in range(MAX_SQL_PARAMS)]  # > 1 statement
+        with connect(tmp_db) as conn:
+            n = bulk_insert(conn, "ingredients", cols, rows)
+            conn.commit()
+        assert n == len(rows)
+        assert table_counts(tmp_db)["ingredients"] == 5 + len(rows)
+
+    def test_or_ignore_skips_existing(self, tmp_db: Path) -> None:
+        with connect(tmp_db) as conn:
+            bulk_insert(conn, "ingredients", ("ingredient_id", "ingredient_name"), [(1, "Dup")])
+            conn.commit()
+        names = {i["ingredient_id"]: i["ingredient_name"] for i in get_all_ingredients(tmp_db)}
+        assert names[1] == "Glucose"
+
+    def test_upsert_clause(self, tmp_db: Path) -> None:
+        with connect(tmp_db) as conn:
+            bulk_insert(
+                conn,
+                "strains",
+                ("strain_id", "species"),
+                [(101, "Renamed"), (103, "New species")],
+                conflict="",
+                upsert="ON CONFLICT(strain_id) DO UPDATE SET species = excluded.species",
+            )
+            conn.commit()
+            rows = dict(conn.execute("SELECT strain_id, species FROM strains").fetchall())
+        assert rows == {101: "Renamed", 102: "Escherichia coli", 103: "New species"}
+
+
+@pytest.mark.unit
+class TestMaintenance:
+    @staticmethod
+    def _indexes(conn) -> set[str]:
+        placeholders = ", ".join("?" * len(BULK_TABLES))
+        rows = conn.execute(
+            f"SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+            f"AND tbl_name IN ({placeholders})",
+            BULK_TABLES,
+        ).fetchall()
+        return {r[0] for r in rows}
+
+    def test_drop_and_rebuild_round_trip(self, tmp_db: Path) -> None:
+        with connect(tmp_db) as conn:
+            before = self._indexes(conn)
+            ddl = drop_bulk_indexes(conn)
+            assert self._indexes(conn) == set()
+            rebuild_bulk_indexes(conn, ddl)
+            assert self._indexes(conn) == before
+        assert before  # schema defines indexes on these tables
+
+    def test_empty_tables_skips_populated(self, tmp_db: Path) -> None:
+        with connect(tmp_db) as conn:
+            # seeded: media_composition, strain_growth; solution_recipe is empty
+            assert empty_tables(conn) == ["solution_recipe"]
+
+    def test_checkpoint_truncates_wal(self, tmp_db: Path) -> None:
+        wal = tmp_db.with_name(tmp_db.name + "-wal")
+        with connect(tmp_db) as conn:
+            conn.execute("UPDATE media SET media_name = media_name || '!'")
+            conn.commit()
+            assert wal.stat().st_size > 0
+            checkpoint_wal(conn)
+        assert wal.stat().st_size == 0
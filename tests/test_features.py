@@ -1,6 +1,7 @@
 """Tests for the feature engineering pipeline."""
 
 from pathlib import Path
+from unittest.mock import patch
 
 import numpy as np
 import pytest
@@ -35,6 +36,13 @@ class TestMediaVectors:
         # Should have non-zero entries
         assert df.values.sum() > 0
 
+    def test_build_composition_matrix_sums_duplicates(self, tmp_db: Path) -> None:
+        cols = {"media_id": ["M1", "M1", "M2"], "ingredient_id": [1, 1, 3], "g_per_l": [2.0, 3.0, None]}
+        with patch("src.features.media_vectors.get_full_composition_columns", return_value=cols):
+            df, _, idx_map = build_composition_matrix(tmp_db)
+        assert df.loc["M1", idx_map[1]] == 5.0
+        assert df.loc["M2", idx_map[3]] == 0.0
+
     def test_log_scale_concentrations(self, sample_composition_matrix: np.ndarray) -> None:
         import pandas as pd
 
@@ -71,3 +79,5 @@ class TestStrainFeatures:
         row = summary.loc[101]
         assert row["n_media_grew"] == 2
         assert abs(row["growth_rate"] - 2 / 3) < 1e-6
+        # Strain 102 grew on M2 (defined) and M3 (complex)
+        assert summary.loc[102, "pct_complex"] == 0.5
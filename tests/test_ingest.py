@@ -0,0 +1,92 @@
+"""Tests for the ingest drivers (network calls mocked)."""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.db.queries import connect, is_task_done, table_counts
+from src.ingest.fetch_ingredients import fetch_ingredient_list
+from src.ingest.fetch_media import (
+    fetch_all_compositions,
+    fetch_medium_detail,
+    fetch_medium_strains,
+)
+
+
+def _composition_payload(endpoint: str, **kwargs: object) -> list[dict]:
+    return [{"id": 1, "name": "Glucose", "g_l": 1.0}, {"id": 3, "name": "NaCl", "g_l": 0.5}]
+
+
+@pytest.mark.unit
+class TestIngestDrivers:
+    @patch("src.api.client.get_detail")
+    def test_compositions_stored_and_logged(self, mock_get: MagicMock, tmp_db: Path) -> None:
+        with connect(tmp_db) as conn:
+            conn.execute("DELETE FROM media_composition")
+            conn.commit()
+        mock_get.side_effect = _composition_payload
+
+        n = fetch_all_compositions(tmp_db)
+
+        assert n == 6  # 2 rows × 3 media
+        assert mock_get.call_count == 3
+        assert is_task_done("composition:M1", tmp_db)
+
+    @patch("src.api.client.get_detail")
+    def test_done_tasks_are_skipped(self, mock_get: MagicMock, tmp_db: Path) -> None:
+        mock_get.side_effect = _composition_payload
+        fetch_all_compositions(tmp_db)
+        mock_get.reset_mock()
+
+        assert fetch_all_compositions(tmp_db) == 0
+        mock_get.assert_not_called()
+
+    @patch("src.ingest.common.get_detail")
+    def test_fetch_error_is_logged(self, mock_get: MagicMock, tmp_db: Path) -> None:
+        mock_get.side_effect = RuntimeError("boom")
+
+        assert fetch_medium_strains("M1", tmp_db) == 0
+        with connect(tmp_db) as conn:
+            row = conn.execute(
+                "SELECT status, error_message FROM ingest_log WHERE task = 'medium_strains:M1'"
+            ).fetchone()
+        assert tuple(row) == ("error", "boom")
+
+    @patch("src.ingest.common.get_detail")
+    def test_medium_detail_rows(self, mock_get: MagicMock, tmp_db: Path) -> None:
+        mock_get.return_value = {
+            "solutions": [
+                {
+                    "id": 7,
+                    "name": "Main",
+                    "recipe": [
+                        {"recipe_order": 1, "compound_id": 1, "compound": "Glucose", "g_l": 5.0},
+                        {"recipe_order": 2, "compound_id": 3, "compound": "NaCl", "optional": True},
+                    ],
+                    "steps": [{"step": "Dissolve"}, {"step": "Autoclave"}],
+                }
+            ]
+        }
+
+        fetch_medium_detail("M1", tmp_db)
+
+        counts = table_counts(tmp_db)
+        assert counts["solutions"] == 1
+        assert counts["media_solutions"] == 1
+        assert counts["solution_recipe"] == 2
+        assert counts["solution_steps"] == 2
+        with connect(tmp_db) as conn:
+            flag = conn.execute(
+                "SELECT fetched_detail FROM media WHERE media_id = 'M1'"
+            ).fetchone()[0]
+        assert flag == 1
+
+    @patch("src.api.client.get_cached")
+    def test_list_fetch_inserts_every_item(self, mock_get: MagicMock, tmp_db: Path) -> None:
+        items = [{"id": 100 + i, "name": f"Compound {i}"} for i in range(5)]
+        mock_get.return_value = {"data": items}
+
+        assert fetch_ingredient_list(tmp_db) == 5
+        assert table_counts(tmp_db)["ingredients"] == 10
+        assert is_task_done("ingredient_list", tmp_db)